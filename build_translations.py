@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Construit pokemon_translations.json hors ligne, à partir des CSV publiés par PokeAPI.
+
+Pour les serveurs sans accès à pokeapi.co : tous les Pokémon des fichiers de données sont traduits en une
+passe depuis une copie locale du dépôt PokeAPI (https://github.com/PokeAPI/pokeapi, dossier data/v2/csv),
+avec la même normalisation des noms (formes régionales, features) et les mêmes variantes de noms
+que get_pokemon_name. Le cache existant est conservé et complété ; le bot doit être arrêté pendant l'écriture.
+
+Exemple :
+    python build_translations.py --pokeapi-csv ./pokeapi/data/v2/csv --data mes_donnees.xlsx
+"""
+import os
+import csv
+import argparse
+import logging
+
+# Le bot lit ces variables à l'import : valeurs neutres pour un outil en ligne de commande
+os.environ.setdefault("DISCORD_BOT_TOKEN", "offline")
+os.environ.setdefault("DISCORD_GUILD_ID", "0")
+
+import wherepokemon
+
+
+def read_csv(directory, filename):
+    with open(os.path.join(directory, filename), newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def load_species_names(directory):
+    """Retourne {identifiant d'espèce PokeAPI: {langue du bot: nom}} pour les langues du bot"""
+    # languages.csv : l'identifiant est le code utilisé par l'API (fr, de, ja-Hrkt...)
+    our_langs = {}
+    for row in read_csv(directory, "languages.csv"):
+        for our_lang, api_lang in wherepokemon.LANGUAGES.items():
+            if row["identifier"] == api_lang:
+                our_langs[row["id"]] = our_lang
+
+    identifiers = {row["id"]: row["identifier"] for row in read_csv(directory, "pokemon_species.csv")}
+
+    species = {identifier: {} for identifier in identifiers.values()}
+    for row in read_csv(directory, "pokemon_species_names.csv"):
+        our_lang = our_langs.get(row["local_language_id"])
+        identifier = identifiers.get(row["pokemon_species_id"])
+        if our_lang and identifier and row["name"]:
+            species[identifier][our_lang] = row["name"]
+    return species
+
+
+def species_candidates(api_name):
+    """Variantes essayées dans le même ordre que get_pokemon_name : nom tel quel,
+    puis tiret inséré à chaque position, ou première partie d'un nom composé"""
+    yield api_name
+    if "-" not in api_name and len(api_name) > 3:
+        for i in range(1, len(api_name)):
+            yield f"{api_name[:i]}-{api_name[i:]}"
+    if "-" in api_name:
+        yield api_name.split("-")[0]
+
+
+def translation_complete(snapshot, pokemon_name):
+    """Vrai si chaque langue du bot est traduite ou traduite à la main
+    (un ancien cache français seul, par exemple, reste à compléter)"""
+    translations = snapshot.translations.get(pokemon_name) or {}
+    manual = snapshot.undefined.get(pokemon_name) or {}
+    return all(translations.get(lang) or manual.get(lang) for lang in wherepokemon.LANGUAGES)
+
+
+def resolve_translations(pokemon_names, species):
+    """Traduit chaque nom original : retourne ({nom original: {langue: nom}}, noms introuvables)"""
+    resolved = {}
+    missing = []
+    for pokemon_name in pokemon_names:
+        normalized_name, _ = wherepokemon.normalize_pokemon_name(pokemon_name)
+        api_name = wherepokemon.pokeapi_species_name(normalized_name)
+        for candidate in species_candidates(api_name):
+            if species.get(candidate):
+                resolved[pokemon_name] = species[candidate]
+                break
+        else:
+            missing.append(pokemon_name)
+    return resolved, missing
+
+
+def main():
+    default_data = list(dict.fromkeys([wherepokemon.EXCEL_FILE, *wherepokemon.GUILD_DATASETS.values()]))
+    parser = argparse.ArgumentParser(description="Construit le cache de traductions hors ligne depuis les CSV de PokeAPI")
+    parser.add_argument("--pokeapi-csv", required=True,
+                        help="Dossier data/v2/csv d'une copie du dépôt PokeAPI (pokemon_species.csv, pokemon_species_names.csv, languages.csv)")
+    parser.add_argument("--data", nargs="+", default=default_data, help="Fichier(s) .xlsx des données de spawn")
+    parser.add_argument("--output", default=wherepokemon.TRANSLATIONS_CACHE_FILE, help="Cache de traductions à compléter")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Remplace les traductions déjà présentes au lieu de ne compléter que les manquantes")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    try:
+        species = load_species_names(args.pokeapi_csv)
+    except FileNotFoundError as e:
+        raise SystemExit(f"Fichier CSV de PokeAPI introuvable : {e.filename}")
+
+    pokemon_names = []
+    for path in args.data:
+        rows, _ = wherepokemon.read_spawn_rows(path)
+        pokemon_names.extend(wherepokemon.SpawnDataset(wherepokemon.SpawnColumns.from_rows(rows, wherepokemon.SHARED_STRINGS), path=path).names)
+    pokemon_names = list(dict.fromkeys(pokemon_names))
+
+    # Cache existant (snapshot + journal), traductions manuelles comprises
+    wherepokemon.TRANSLATIONS_CACHE_FILE = args.output
+    wherepokemon.TRANSLATIONS_JOURNAL_FILE = os.path.splitext(args.output)[0] + ".journal.jsonl"
+    wherepokemon.load_translations_cache()
+    snapshot = wherepokemon.TRANSLATIONS
+
+    if not args.overwrite:
+        pokemon_names_to_resolve = [name for name in pokemon_names if not translation_complete(snapshot, name)]
+    else:
+        pokemon_names_to_resolve = pokemon_names
+    resolved, missing = resolve_translations(pokemon_names_to_resolve, species)
+
+    # Même enregistrement que les traductions venues de l'API : les noms des CSV complètent les langues
+    # existantes, les langues absentes des CSV sont marquées undefined avec un délai de nouvelle tentative
+    # (un serveur sans accès à PokeAPI ne les redemande pas à chaque démarrage)
+    for pokemon_name in pokemon_names_to_resolve:
+        known = snapshot.translations.get(pokemon_name) or {}
+        names = {lang: name for lang, name in resolved.get(pokemon_name, {}).items()
+                 if args.overwrite or not known.get(lang)}
+        wherepokemon.store_translations(pokemon_name, names)
+    wherepokemon.save_translations_cache()
+    incomplete = sum(1 for name in resolved if not translation_complete(wherepokemon.TRANSLATIONS, name))
+
+    print(f"{len(pokemon_names)} Pokémon dans les données, {len(pokemon_names) - len(pokemon_names_to_resolve)} déjà traduits "
+          f"dans toutes les langues, {len(resolved)} traduits depuis les CSV ({incomplete} incomplets), "
+          f"{len(missing)} introuvables -> {args.output}")
+    if missing:
+        # Marqués undefined : le préchargement en ligne les retentera après le délai, ou une traduction manuelle les complétera
+        print("Introuvables : " + ", ".join(missing))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""Banc de charge hors ligne pour wherepokemon.py.
+
+Rejoue un mélange réaliste de recherches et d'autocomplétions (préfixes, noms complets, valeurs exactes
+d'autocomplétion, les quatre langues, show_all activé ou non) contre un jeu de données choisi, avec des
+interactions Discord factices qui enregistrent les envois. Aucun accès réseau : la résolution des
+traductions en arrière-plan n'est pas démarrée, seules les traductions déjà en cache sont utilisées.
+
+Exemple :
+    python loadtest.py --data /documents/mes_donnees.xlsx --requests 2000 --concurrency 50
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import logging
+import types
+
+# Le bot lit ces variables à l'import : valeurs neutres pour un banc de charge
+os.environ.setdefault("DISCORD_BOT_TOKEN", "loadtest")
+os.environ.setdefault("DISCORD_GUILD_ID", "0")
+os.environ.setdefault("TRANSLATION_LOOKUP_TIMEOUT", "0")
+os.environ.setdefault("AUTOCOMPLETE_DEBOUNCE_MS", "0")
+
+import wherepokemon
+
+
+class FakeResponse:
+    """Équivalent de interaction.response : enregistre la réponse initiale"""
+
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self.done = False
+
+    async def send_message(self, content=None, **kwargs):
+        await self.interaction.api_call("send_message", content, kwargs)
+        self.done = True
+
+    async def defer(self, **kwargs):
+        await self.interaction.api_call("defer", None, kwargs)
+        self.done = True
+
+    async def edit_message(self, content=None, **kwargs):
+        await self.interaction.api_call("edit_message", content, kwargs)
+
+    def is_done(self):
+        return self.done
+
+
+class FakeFollowup:
+    """Équivalent de interaction.followup : enregistre les messages de suivi"""
+
+    def __init__(self, interaction):
+        self.interaction = interaction
+
+    async def send(self, content=None, **kwargs):
+        await self.interaction.api_call("followup", content, kwargs)
+
+
+class FakeInteraction:
+    """Interaction Discord factice : chaque appel d'API est enregistré et peut simuler une latence réseau"""
+
+    def __init__(self, user_id, api_latency=0.0, guild_id=None):
+        self.user = types.SimpleNamespace(id=user_id)
+        self.guild_id = guild_id if guild_id is not None else wherepokemon.GUILD_ID
+        self.namespace = types.SimpleNamespace()
+        self.api_latency = api_latency
+        self.sends = []
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    async def api_call(self, kind, content, kwargs):
+        if self.api_latency:
+            await asyncio.sleep(self.api_latency)
+        self.sends.append((kind, content, kwargs))
+
+    async def edit_original_response(self, content=None, **kwargs):
+        await self.api_call("edit_original", content, kwargs)
+
+
+def percentile(values, pct):
+    """Percentile au rang le plus proche (valeurs triées)"""
+    if not values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+def summarize(values):
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+    }
+
+
+def build_query_mix(dataset, translations, langs, count, rng):
+    """Construit la liste des requêtes à rejouer : (type, langue, texte, show_all)"""
+    names = list(dataset.names)
+    if not names:
+        raise SystemExit("Le jeu de données ne contient aucun Pokémon.")
+
+    queries = []
+    for _ in range(count):
+        lang = rng.choice(langs)
+        original = rng.choice(names)
+        # Nom affiché dans la langue de la commande, s'il est déjà en cache
+        display = (translations.get(original) or {}).get(lang) or original
+        prefix = display[:rng.randint(1, min(4, len(display)))]
+        kind = rng.random()
+        if kind < 0.40:
+            # Frappe au clavier : l'autocomplétion est appelée à chaque préfixe
+            queries.append(("autocomplete", lang, prefix, False))
+        elif kind < 0.65:
+            queries.append(("search", lang, prefix, rng.random() < 0.2))
+        elif kind < 0.90:
+            queries.append(("search", lang, display, rng.random() < 0.3))
+        else:
+            # Valeur choisie dans la liste d'autocomplétion
+            queries.append(("search", lang, f"{display}|{original}", rng.random() < 0.3))
+    return queries
+
+
+async def monitor_loop_lag(interval, lags, stop):
+    """Mesure le retard de la boucle d'événements : écart entre le réveil prévu et le réveil réel"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run_load(queries, concurrency, api_latency):
+    """Rejoue les requêtes avec `concurrency` interactions simultanées au plus"""
+    latencies = {}
+    sends = 0
+    errors = 0
+    lags = []
+    stop = asyncio.Event()
+    pending = iter(enumerate(queries))
+
+    async def worker():
+        nonlocal sends, errors
+        for user_id, (kind, lang, text, show_all) in pending:
+            interaction = FakeInteraction(user_id, api_latency)
+            command = "pokemon_search" if kind == "search" else "pokemon_autocomplete"
+            start = time.perf_counter()
+            try:
+                # Même chemin que les commandes enregistrées : trace, métriques et journal des requêtes lentes
+                with wherepokemon.trace_interaction(command, lang, text):
+                    if kind == "search":
+                        await wherepokemon.pokemon_search(interaction, text, lang, show_all)
+                    else:
+                        await wherepokemon.pokemon_autocomplete(interaction, text, lang)
+            except Exception as e:
+                errors += 1
+                logging.error(f"Erreur sur {command} {lang} « {text} » : {e}")
+                continue
+            latencies.setdefault((kind, lang), []).append(time.perf_counter() - start)
+            sends += len(interaction.sends)
+
+    monitor = asyncio.create_task(monitor_loop_lag(0.01, lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+    return latencies, lags, sends, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc de charge hors ligne des commandes de recherche et d'autocomplétion")
+    parser.add_argument("--data", default=wherepokemon.EXCEL_FILE, help="Fichier .xlsx des données de spawn")
+    parser.add_argument("--translations", default=None,
+                        help="Cache de traductions à utiliser (par défaut aucun : noms originaux uniquement)")
+    parser.add_argument("--requests", type=int, default=1000, help="Nombre total de requêtes à rejouer")
+    parser.add_argument("--concurrency", type=int, default=20, help="Nombre d'interactions simultanées")
+    parser.add_argument("--langs", default=",".join(wherepokemon.LANGUAGE_PACKS), help="Langues à utiliser, séparées par des virgules")
+    parser.add_argument("--api-latency-ms", type=float, default=0.0, help="Latence simulée de chaque appel à l'API Discord")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur de requêtes (rejouable)")
+    parser.add_argument("--json", action="store_true", help="Affiche le rapport en JSON")
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="Code de sortie 1 si le p95 global dépasse ce seuil (CI)")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    # Jamais d'attente réseau pendant une commande, quelle que soit la configuration,
+    # ni d'attente volontaire de l'autocomplétion : les percentiles mesurent le traitement
+    wherepokemon.TRANSLATION_LOOKUP_TIMEOUT = 0
+    wherepokemon.AUTOCOMPLETE_DEBOUNCE_MS = 0
+
+    # Données et traductions chargées comme au démarrage du bot, sans thread d'arrière-plan
+    wherepokemon.EXCEL_FILE = args.data
+    if args.translations:
+        wherepokemon.TRANSLATIONS_CACHE_FILE = args.translations
+        wherepokemon.TRANSLATIONS_JOURNAL_FILE = os.path.splitext(args.translations)[0] + ".journal.jsonl"
+        wherepokemon.load_translations_cache()
+    dataset = wherepokemon.load_spawn_data_from_excel()
+    if not dataset.rows:
+        raise SystemExit(f"Aucune donnée chargée depuis {args.data}.")
+
+    langs = [lang for lang in args.langs.split(",") if lang]
+    rng = random.Random(args.seed)
+    queries = build_query_mix(dataset, wherepokemon.TRANSLATIONS.translations, langs, args.requests, rng)
+
+    latencies, lags, sends, errors, elapsed = asyncio.run(run_load(queries, args.concurrency, args.api_latency_ms / 1000))
+
+    report = {
+        "rows": len(dataset.rows),
+        "requests": len(queries),
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "sends": sends,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(queries) / elapsed, 1) if elapsed else 0.0,
+        "overall": summarize([value for values in latencies.values() for value in values]),
+        "by_kind": {},
+        "event_loop_lag": summarize(lags),
+    }
+    for kind in ("search", "autocomplete"):
+        values = [value for (k, _), values in latencies.items() if k == kind for value in values]
+        report["by_kind"][kind] = summarize(values)
+        report["by_kind"][kind]["by_lang"] = {lang: summarize(latencies.get((kind, lang), [])) for lang in langs}
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(f"{report['requests']} requêtes sur {report['rows']} lignes, concurrence {args.concurrency} : "
+              f"{report['elapsed_s']} s, {report['throughput_rps']} req/s, {sends} envois, {errors} erreurs")
+        print(f"{'':<14}{'n':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        rows = [("global", report["overall"])]
+        for kind, stats in report["by_kind"].items():
+            rows.append((kind, stats))
+            rows.extend((f"  {kind[:6]} {lang}", lang_stats) for lang, lang_stats in stats["by_lang"].items())
+        rows.append(("boucle (lag)", report["event_loop_lag"]))
+        for label, stats in rows:
+            print(f"{label:<14}{stats['count']:>7}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['max_ms']:>10}")
+
+    if errors or (args.max_p95_ms is not None and report["overall"]["p95_ms"] > args.max_p95_ms):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Le bot lit ces variables à l'import : valeurs neutres pour les tests
+os.environ.setdefault("DISCORD_BOT_TOKEN", "test")
+os.environ.setdefault("DISCORD_GUILD_ID", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
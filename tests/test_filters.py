@@ -0,0 +1,44 @@
+"""Filtres multi-critères : bitmaps par valeur, jokers et combinaison des filtres"""
+import wherepokemon
+
+
+ROWS = [
+    {"Pokemon": "Pikachu", "Bucket": "common", "Time Range": "day", "Is Raining": True, "Can See Sky": "1.0", "Key Item": None,
+     "Contexte": "grounded | seafloor"},
+    {"Pokemon": "Vulpix", "Bucket": "rare", "Time Range": "night", "Is Raining": False, "Can See Sky": 0, "Key Item": "Fire Stone",
+     "Contexte": "grounded"},
+    {"Pokemon": "Pikachu", "Bucket": "uncommon", "Time Range": "any", "Is Raining": None, "Can See Sky": "", "Key Item": ""},
+    {"Pokemon": "Alolan Vulpix", "Bucket": "rare", "Time Range": None, "Is Raining": "true", "Can See Sky": 1, "Key Item": "Ice Stone"},
+]
+
+
+def in_memory(rows):
+    return wherepokemon.SpawnDataset(wherepokemon.SpawnColumns.from_rows(rows, wherepokemon.StringTable()))
+
+
+def matching_rows(dataset, filters):
+    return list(wherepokemon.iter_bits(wherepokemon.query_filters(dataset, filters)))
+
+
+def test_filter_values_are_normalized():
+    dataset = in_memory(ROWS)
+    # Booléens relus en bool, en 1.0/0.0 ou en texte
+    assert matching_rows(dataset, {"raining": "true"}) == [0, 2, 3]  # cellule vide : sans contrainte
+    assert matching_rows(dataset, {"raining": "false"}) == [1, 2]
+    assert matching_rows(dataset, {"sky": "true"}) == [0, 2, 3]
+    assert matching_rows(dataset, {"bucket": "rare"}) == [1, 3]
+    # Champs multi-valeurs : chaque valeur séparée par | est indexée
+    assert matching_rows(dataset, {"context": "seafloor"}) == [0]
+    assert matching_rows(dataset, {"context": "grounded"}) == [0, 1]
+
+
+def test_filter_wildcards_and_combination():
+    dataset = in_memory(ROWS)
+    # « any » et la cellule vide acceptent toutes les heures
+    assert matching_rows(dataset, {"time": "day"}) == [0, 2, 3]
+    # « * » : valeur renseignée, sans ajout des cellules vides pour les colonnes sans joker
+    assert matching_rows(dataset, {"key_item": "*"}) == [1, 3]
+    # Un ET entre filtres
+    assert matching_rows(dataset, {"bucket": "rare", "key_item": "Ice Stone"}) == [3]
+    assert matching_rows(dataset, {"bucket": "common", "key_item": "*"}) == []
+    assert matching_rows(dataset, {}) == [0, 1, 2, 3]
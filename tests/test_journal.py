@@ -0,0 +1,67 @@
+"""Journal des traductions : rejeu au démarrage, y compris après un arrêt brutal pendant une écriture"""
+import json
+
+import pytest
+
+import wherepokemon
+
+
+@pytest.fixture
+def cache_files(tmp_path, monkeypatch):
+    cache_file = tmp_path / "pokemon_translations.json"
+    journal_file = tmp_path / "pokemon_translations.journal.jsonl"
+    monkeypatch.setattr(wherepokemon, "TRANSLATIONS_CACHE_FILE", str(cache_file))
+    monkeypatch.setattr(wherepokemon, "TRANSLATIONS_JOURNAL_FILE", str(journal_file))
+    monkeypatch.setattr(wherepokemon, "TRANSLATIONS", wherepokemon.TranslationSnapshot.build({}, {}))
+    return cache_file, journal_file
+
+
+def test_replay_ignores_truncated_last_line(cache_files):
+    cache_file, journal_file = cache_files
+    cache_file.write_text(json.dumps({"translations": {"Pikachu": {"fr": "Pikachu"}}, "undefined_translations": {}}),
+                          encoding="utf-8")
+    records = [
+        {"name": "Vulpix", "translations": {"fr": "Goupix"}},
+        {"name": "Zubat", "undefined": {"fr": None}, "failure": {"attempts": 1, "retry_at": 0}},
+    ]
+    journal_file.write_text("".join(json.dumps(record) + "\n" for record in records)
+                            + '{"name": "Charmander", "translations": {"fr": "Sala', encoding="utf-8")
+    
+    wherepokemon.load_translations_cache()
+    snapshot = wherepokemon.TRANSLATIONS
+    assert snapshot.translations["Vulpix"] == {"fr": "Goupix"}
+    assert snapshot.translations["Pikachu"] == {"fr": "Pikachu"}
+    assert "Charmander" not in snapshot.translations
+    assert snapshot.undefined["Zubat"] == {"fr": None}
+    assert snapshot.failures["Zubat"]["attempts"] == 1
+    
+    # Le journal abîmé est compacté dans le snapshot : les prochains ajouts ne suivent pas la ligne tronquée
+    assert journal_file.read_text(encoding="utf-8") == ""
+    assert json.loads(cache_file.read_text(encoding="utf-8"))["translations"]["Vulpix"] == {"fr": "Goupix"}
+
+
+def test_replay_applies_failure_clear(cache_files):
+    _, journal_file = cache_files
+    records = [
+        {"name": "Zubat", "undefined": {"fr": None}, "failure": {"attempts": 2, "retry_at": 0}},
+        {"name": "Zubat", "translations": {"fr": "Nosferapti"}, "failure": None},
+    ]
+    journal_file.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+    
+    wherepokemon.load_translations_cache()
+    assert wherepokemon.TRANSLATIONS.translations["Zubat"] == {"fr": "Nosferapti"}
+    assert "Zubat" not in wherepokemon.TRANSLATIONS.failures
+
+
+def test_stored_translations_survive_restart(cache_files, monkeypatch):
+    _, journal_file = cache_files
+    monkeypatch.setattr(wherepokemon, "_journal_entries", 0)
+    wherepokemon.store_translations("Vulpix", {lang: f"Vulpix-{lang}" for lang in wherepokemon.LANGUAGES})
+    wherepokemon.publish_translations()
+    # Ajout seul : une ligne par enregistrement, sans réécrire le snapshot
+    assert len(journal_file.read_text(encoding="utf-8").splitlines()) == 1
+    
+    # Redémarrage : le snapshot repart de zéro et le journal est rejoué
+    monkeypatch.setattr(wherepokemon, "TRANSLATIONS", wherepokemon.TranslationSnapshot.build({}, {}))
+    wherepokemon.load_translations_cache()
+    assert wherepokemon.TRANSLATIONS.translations["Vulpix"]["fr"] == "Vulpix-fr"
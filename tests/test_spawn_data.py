@@ -0,0 +1,67 @@
+"""Stockage colonnaire des données de spawn et snapshot projeté (.col)"""
+import os
+
+import pytest
+
+import wherepokemon
+
+
+ROWS = [
+    {"Pokemon": "Pikachu", "Biomes": "Forest | Plains", "Bucket": "common", "Time Range": "day",
+     "Is Raining": True, "Can See Sky": "1.0", "Key Item": None},
+    {"Pokemon": "Vulpix", "Biomes": "Desert", "Bucket": "rare", "Time Range": "night",
+     "Is Raining": False, "Can See Sky": 0, "Key Item": "Fire Stone"},
+    {"Pokemon": "Pikachu", "Biomes": "Plains", "Bucket": "uncommon", "Time Range": "any",
+     "Is Raining": None, "Can See Sky": "", "Key Item": ""},
+    {"Pokemon": "Alolan Vulpix", "Biomes": "Snowy Plains|Forest", "Bucket": "rare", "Time Range": None,
+     "Is Raining": "true", "Can See Sky": 1, "Key Item": "Ice Stone"},
+]
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "donnees.xlsx"
+    path.write_bytes(b"excel")
+    return str(path)
+
+
+def in_memory(rows):
+    return wherepokemon.SpawnDataset(wherepokemon.SpawnColumns.from_rows(rows, wherepokemon.StringTable()))
+
+
+def test_mapped_snapshot_round_trip(source):
+    source_stat = os.stat(source)
+    wherepokemon.write_mapped_snapshot(ROWS, source_stat, "hash", source)
+    mapped = wherepokemon.MappedSpawnSnapshot(wherepokemon.mapped_snapshot_file(source))
+    assert mapped.header["source_size"] == source_stat.st_size
+    
+    expected = in_memory(ROWS)
+    dataset = wherepokemon.SpawnDataset(mapped)
+    assert {name: list(rows) for name, rows in dataset.rows_by_name.items()} == expected.rows_by_name
+    assert {biome: list(rows) for biome, rows in dataset.rows_by_biome.items()} == expected.rows_by_biome
+    assert mapped.columns == expected.store.columns
+    for row_id in range(len(ROWS)):
+        for column in expected.store.columns:
+            assert dataset.rows[row_id][column] == expected.rows[row_id][column]
+    # Bitmaps des filtres lus dans le fichier projeté, pas reconstruits
+    assert all(isinstance(bitmap, wherepokemon.MappedBitmaps) for bitmap in dataset.bitmaps.values())
+    assert dataset.bitmaps == expected.bitmaps
+    assert dataset.non_empty == expected.non_empty
+
+
+def test_mapped_snapshot_missing_column(source):
+    wherepokemon.write_mapped_snapshot(ROWS, os.stat(source), "hash", source)
+    row = wherepokemon.SpawnDataset(wherepokemon.MappedSpawnSnapshot(wherepokemon.mapped_snapshot_file(source))).rows[0]
+    assert row.get("Moon Phase") == "∅"
+    assert row.get("Moon Phase", None) is None
+    with pytest.raises(KeyError):
+        row["Moon Phase"]
+
+
+def test_mapped_snapshot_write_failure_leaves_no_temporary_file(source, monkeypatch):
+    def fail(src, dst):
+        raise OSError("disque plein")
+    monkeypatch.setattr(wherepokemon.os, "replace", fail)
+    with pytest.raises(OSError):
+        wherepokemon.write_mapped_snapshot(ROWS, os.stat(source), "hash", source)
+    assert [name for name in os.listdir(os.path.dirname(source)) if name.endswith(".tmp")] == []
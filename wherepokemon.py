@@ -1,15 +1,38 @@
+import time
+_STARTUP_T0 = time.perf_counter()  # Référence pour mesurer le démarrage à froid, avant les imports
+
 import discord
-import pandas as pd
 from discord.ext import commands
 from discord import app_commands
 import os
 import logging
 import re
-import textwrap
 import requests
 import json
-import time
 import threading
+import hashlib
+import pickle
+import queue
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+import io
+import bisect
+import contextvars
+import signal
+import sys
+import itertools
+import weakref
+import unicodedata
+import mmap
+import struct
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# pandas et openpyxl ne sont importés que pour relire le fichier Excel (voir read_spawn_rows_from_excel)
+STARTUP_TIMINGS = {"imports": time.perf_counter() - _STARTUP_T0}
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,74 +41,542 @@ logging.basicConfig(
 )
 
 TOKEN = os.getenv("DISCORD_BOT_TOKEN")
-GUILD_ID = int(os.getenv("DISCORD_GUILD_ID", "0"))
+# Un ou plusieurs serveurs, séparés par des virgules : les commandes y sont synchronisées immédiatement
+GUILD_IDS = [int(guild_id) for guild_id in os.getenv("DISCORD_GUILD_ID", "").replace(" ", "").split(",") if guild_id]
+GUILD_ID = GUILD_IDS[0] if GUILD_IDS else 0
+# Commandes globales (tous les serveurs où le bot est invité ; la propagation par Discord peut prendre jusqu'à une heure)
+GLOBAL_COMMANDS = os.getenv("DISCORD_GLOBAL_COMMANDS", "0") == "1"
+# Répartition automatique en shards pour les bots présents sur de nombreux serveurs
+AUTO_SHARD = os.getenv("DISCORD_AUTO_SHARD", "0") == "1"
+SHARD_COUNT = int(os.getenv("DISCORD_SHARD_COUNT", "0")) or None  # None = nombre recommandé par Discord
 EXCEL_FILE = "/documents/mes_donnees.xlsx"
+# Fichier de données propre à certains serveurs (un modpack par serveur) : "id_serveur=chemin.xlsx,id_serveur=chemin.xlsx".
+# Les serveurs absents de la liste utilisent EXCEL_FILE.
+GUILD_DATASETS = {int(guild_id): path for guild_id, _, path in
+                  (item.strip().partition("=") for item in os.getenv("GUILD_DATASETS", "").split(",") if "=" in item)}
+# Snapshot binaire des données (à côté de chaque fichier Excel), régénéré automatiquement quand le fichier change
+SPAWN_SNAPSHOT_VERSION = 1
+# Snapshot colonnaire projeté en mémoire (mmap, lecture seule) : plusieurs processus du bot sur une même machine
+# partagent une seule copie physique des données et de leurs index. 1 = activé.
+SPAWN_DATA_MMAP = os.getenv("SPAWN_DATA_MMAP", "0") == "1"
+MAPPED_SNAPSHOT_VERSION = 2
 TRANSLATIONS_CACHE_FILE = "/documents/pokemon_translations.json"
-TRANSLATIONS_CACHE = {}
-UNDEFINED_TRANSLATIONS = {}  # Pour stocker les traductions qui retournent undefined
-REVERSE_TRANSLATIONS = {}  # Pour rechercher par nom dans chaque langue
+# Journal en ajout seul : chaque nouvelle traduction est une ligne JSON, compactée périodiquement dans le snapshot
+TRANSLATIONS_JOURNAL_FILE = os.path.splitext(TRANSLATIONS_CACHE_FILE)[0] + ".journal.jsonl"
+JOURNAL_COMPACT_THRESHOLD = 500
+# Nombre de traductions préchargées regroupées avant publication d'un nouveau snapshot
+TRANSLATION_PUBLISH_BATCH = 10
+# Requêtes PokeAPI : une session HTTP partagée (connexions réutilisées) et un cache disque des réponses,
+# revalidé par ETag / Last-Modified une fois sa durée de fraîcheur écoulée. HTTP_CACHE_DIR vide = pas de cache disque.
+POKEAPI_BASE_URL = "https://pokeapi.co/api/v2"
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(os.path.dirname(TRANSLATIONS_CACHE_FILE), "pokeapi_cache"))
+HTTP_CACHE_DEFAULT_MAX_AGE = 24 * 3600   # si la réponse n'indique pas de max-age
+HTTP_CACHE_NEGATIVE_TTL = 24 * 3600      # durée de conservation d'un 404
+HTTP_TIMEOUT = 10
+# Préchargement : file des espèces restantes et demandes des utilisateurs, persistées pour reprendre après un redémarrage
+PRELOAD_STATE_FILE = os.path.splitext(TRANSLATIONS_CACHE_FILE)[0] + ".preload.json"
+PRELOAD_WORKERS = int(os.getenv("PRELOAD_WORKERS", "2"))
+PRELOAD_DELAY = 1.0  # pause de chaque worker entre deux espèces
+# Une traduction introuvable (ou une panne de PokeAPI) est retentée plus tard : 1 h, puis 2 h, 4 h... jusqu'à 7 jours
+UNDEFINED_RETRY_BASE = 3600
+UNDEFINED_RETRY_MAX = 7 * 24 * 3600
 
-# Codes de langue pour PokeAPI
-LANGUAGES = {
-    "en": "en",    # anglais
-    "fr": "fr",    # français
-    "de": "de",    # allemand
-    "ja": "roomaji" # japonais (romaji)
-}
+# Budget de temps (secondes) pour attendre une traduction manquante pendant une commande.
+# 0 = ne jamais attendre : le nom original est affiché et la traduction est résolue en arrière-plan.
+TRANSLATION_LOOKUP_TIMEOUT = float(os.getenv("TRANSLATION_LOOKUP_TIMEOUT", "0"))
 
-# Commandes par langue
-COMMANDS = {
-    "en": "where",
-    "fr": "tesou",
-    "de": "wobistdu",
-    "ja": "doko"
-}
+# Point de terminaison HTTP des métriques (format Prometheus sur /metrics, JSON sur /stats). 0 = désactivé.
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
 
-# Descriptions des commandes par langue
-COMMAND_DESCRIPTIONS = {
-    "en": "Shows spawn information for a Pokémon",
-    "fr": "Affiche les conditions de spawn d'un Pokémon",
-    "de": "Zeigt Spawn-Informationen für ein Pokémon",
-    "ja": "ポケモンのスポーン情報を表示"
-}
+# Autocomplétion : délai d'attente d'une frappe plus récente avant de calculer (0 = désactivé),
+# et durée de vie des derniers résultats de chaque utilisateur, affinés quand la saisie s'allonge
+AUTOCOMPLETE_DEBOUNCE_MS = float(os.getenv("AUTOCOMPLETE_DEBOUNCE_MS", "100"))
+AUTOCOMPLETE_CACHE_TTL = 60
+AUTOCOMPLETE_SESSIONS_MAX = 2048
+
+# Toute interaction plus longue que ce seuil (ms) est journalisée avec le détail de ses étapes
+SLOW_REQUEST_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "1000"))
+# Profileur par échantillonnage : actif dès le démarrage si SAMPLING_PROFILER=1, sinon activable à chaud
+SAMPLING_PROFILER = os.getenv("SAMPLING_PROFILER", "0") == "1"
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "10"))
+
+# Catalogue de localisation : labels, messages, commandes et formes régionales de chaque langue
+LOCALIZATION_FILE = os.getenv("LOCALIZATION_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "localization.json"))
+
+class LanguagePack:
+    """Textes d'une langue compilés une fois au démarrage : le rendu ne construit aucun dictionnaire"""
+    
+    def __init__(self, code, data, catalog_fields):
+        self.code = code
+        self.pokeapi = data["pokeapi"]  # code de langue pour PokeAPI
+        self.command = data["command"]
+        self.description = data["description"]
+        self.option_pokemon = data["options"]["pokemon"]
+        self.option_show_all = data["options"]["show_all"]
+        
+        # Modèles de messages (str.format)
+        messages = data["messages"]
+        self.not_found = messages["not_found"]
+        self.searching = messages["searching"]
+        self.header = messages["header"]
+        self.header_with_original = messages["header_with_original"]
+        self.no_info = messages["no_info"]
+        self.part = messages["part"]
+        self.page = messages["page"]
+        self.attachment = messages["attachment"]
+        self.continued = messages["continued"]
+        
+        self.regional_forms = data.get("regional_forms", {})
+        
+        # Commande inverse « qu'est-ce qui apparaît dans ce biome ? »
+        biome_command = data.get("biome_command")
+        self.biome_command = biome_command["command"] if biome_command else None
+        if biome_command:
+            self.biome_description = biome_command["description"]
+            self.option_biome = biome_command["options"]["biome"]
+            self.option_time = biome_command["options"]["time"]
+            self.biome_not_found = biome_command["messages"]["not_found"]
+            self.biome_title = biome_command["messages"]["title"]
+            self.biome_legend = biome_command["messages"]["legend"]
+        
+        # Commande de filtres multi-critères
+        filter_command = data.get("filter_command")
+        self.filter_command = filter_command["command"] if filter_command else None
+        if filter_command:
+            self.filter_description = filter_command["description"]
+            self.filter_options = filter_command["options"]
+            self.filter_no_filter = filter_command["messages"]["no_filter"]
+            self.filter_not_found = filter_command["messages"]["not_found"]
+            self.filter_title = filter_command["messages"]["title"]
+        
+        # Liste ordonnée des champs affichés : (emoji, label, colonne, peut être découpé)
+        labels = data.get("fields", {})
+        self.fields = [(field["emoji"], labels.get(field["column"], field["column"]), field["column"], field.get("split", False))
+                       for field in catalog_fields]
+
+def load_localization_catalog(path):
+    """Charge le catalogue de localisation et compile une LanguagePack par langue"""
+    with open(path, 'r', encoding='utf-8') as f:
+        catalog = json.load(f)
+    return {code: LanguagePack(code, data, catalog["fields"]) for code, data in catalog["languages"].items()}
+
+LANGUAGE_PACKS = load_localization_catalog(LOCALIZATION_FILE)
+
+# Codes de langue pour PokeAPI
+LANGUAGES = {code: pack.pokeapi for code, pack in LANGUAGE_PACKS.items()}
 
 # Formes régionales: correspondance anglais-translations
-REGIONAL_FORMS = {
-    "alolan": {
-        "en": "Alolan",
-        "fr": "d'Alola",
-        "de": "von Alola",
-        "ja": "Alolan"
-    },
-    "paldean": {
-        "en": "Paldean",
-        "fr": "de Paldea",
-        "de": "von Paldea",
-        "ja": "Paldean"
-    },
-    "galarian": {
-        "en": "Galarian",
-        "fr": "de Galar",
-        "de": "von Galar",
-        "ja": "Galarian"
-    },
-    "hisuian": {
-        "en": "Hisuian",
-        "fr": "de Hisui",
-        "de": "von Hisui",
-        "ja": "Hisuian"
-    }
+REGIONAL_FORMS = {}
+for pack in LANGUAGE_PACKS.values():
+    for form in pack.regional_forms:
+        REGIONAL_FORMS.setdefault(form, {})
+for form, forms in REGIONAL_FORMS.items():
+    for code, pack in LANGUAGE_PACKS.items():
+        # Une langue qui ne traduit pas une forme garde le nom anglais
+        forms[code] = pack.regional_forms.get(form, form.capitalize())
+
+# Nombre de secondes entre deux vérifications du fichier Excel pour le rechargement à chaud (0 = désactivé)
+SPAWN_RELOAD_INTERVAL = float(os.getenv("SPAWN_RELOAD_INTERVAL", "30"))
+# Nombre maximal de réponses mises en forme gardées en cache (0 = pas de cache)
+RENDER_CACHE_SIZE = int(os.getenv("RENDER_CACHE_SIZE", "256"))
+# Durée de vie des boutons de pagination (doit rester sous les 15 minutes du jeton d'interaction)
+PAGINATION_TIMEOUT = 600
+EMBED_TITLE_LIMIT = 256
+EMBED_DESCRIPTION_LIMIT = 4096
+# Colonnes filtrables par la commande de filtres : option -> (colonne, valeurs qui ne posent aucune contrainte)
+# Une ligne sans contrainte de météo, d'heure ou de dimension apparaît quelle que soit la valeur demandée.
+FILTER_COLUMNS = {
+    "bucket": ("Bucket", ()),
+    "dimension": ("Dimensions", ("∅",)),
+    "time": ("Time Range", ("∅", "any")),
+    "raining": ("Is Raining", ("∅",)),
+    "thundering": ("Is Thundering", ("∅",)),
+    "sky": ("Can See Sky", ("∅",)),
+    "context": ("Contexte", ()),
+    "moon_phase": ("Moon Phase", ("∅",)),
+    "key_item": ("Key Item", ()),
 }
+# Colonnes booléennes : l'Excel peut les relire en bool, en 1.0/0.0 ou en texte
+FLAG_COLUMNS = {"Is Raining", "Is Thundering", "Can See Sky"}
+# Ordre d'affichage des raretés dans les réponses par biome (les autres suivent par ordre alphabétique)
+BUCKET_ORDER = ["common", "uncommon", "rare", "ultra-rare"]
+EMBED_COLOR = 0x3B88C3
+# Limites Discord d'un message : 10 embeds, 6000 caractères au total et 10 fichiers joints
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_FILES_PER_MESSAGE = 10
+MESSAGE_EMBED_CHAR_BUDGET = 6000
+# Au-delà de cette longueur, une liste (biomes...) est envoyée en fichier texte joint
+LONG_FIELD_ATTACHMENT_LIMIT = 3000
+# Nombre de nouvelles tentatives après une réponse 429 de Discord
+MAX_RATE_LIMIT_RETRIES = 3
+
+class SpawnDataset:
+    """Données de spawn d'un fichier Excel et leurs index de recherche.
+    Un jeu chargé n'est jamais modifié : un rechargement en construit un nouveau et le remplace d'un bloc dans DATASETS."""
+    
+    def __init__(self, store, source_signature=None, path=None):
+        self.store = store  # stockage colonnaire en mémoire (SpawnColumns) ou snapshot projeté (MappedSpawnSnapshot)
+        self.rows = RowViews(store)
+        self.source_signature = source_signature  # (mtime_ns, taille) du fichier Excel source
+        self.path = path
+        # Identifiant unique du jeu chargé (tous fichiers confondus), utilisé par le cache des réponses
+        self.generation = next(_dataset_generations)
+        row_count = store.row_count
+        
+        # Index par nom de Pokémon (dans l'ordre du fichier) et index inverse biome -> lignes,
+        # repris tels quels du snapshot projeté s'il y en a un. Les colonnes étant codées, chaque valeur
+        # distincte n'est analysée qu'une fois, quel que soit le nombre de lignes qui la partagent.
+        if store.rows_by_name is not None:
+            self.rows_by_name = store.rows_by_name
+            self.rows_by_biome = store.rows_by_biome
+        else:
+            self.rows_by_name = {store.string(code): row_ids for code, row_ids in group_rows(store, "Pokemon").items() if code}
+            self.rows_by_biome = {}
+            for code, row_ids in group_rows(store, "Biomes").items():
+                for biome in split_list_field(store.string(code)):
+                    self.rows_by_biome.setdefault(biome, []).extend(row_ids)
+            for row_ids in self.rows_by_biome.values():
+                row_ids.sort()
+        # Bitmaps par valeur des colonnes filtrables : colonne -> {valeur: entier dont le bit i = ligne i},
+        # lus dans le snapshot projeté s'il y en a un
+        if store.bitmaps is not None:
+            self.bitmaps = store.bitmaps
+        else:
+            self.bitmaps = {column: {} for column, _ in FILTER_COLUMNS.values()}
+            for column, bitmap in self.bitmaps.items():
+                for code, row_ids in group_rows(store, column).items():
+                    bits = rows_bitmap(row_ids, row_count)
+                    for value in filter_values(column, store.string(code)):
+                        bitmap[value] = bitmap.get(value, 0) | bits
+        self.names = list(self.rows_by_name)
+        self.biomes = sorted(self.rows_by_biome)  # trié pour l'autocomplétion par préfixe
+        self.all_rows = (1 << row_count) - 1
+        # Lignes ayant une valeur renseignée, pour le filtre « * » (par ex. « nécessite un objet clé »)
+        self.non_empty = {column: self.all_rows & ~bitmap.get("∅", 0) for column, bitmap in self.bitmaps.items()}
+        self.time_ranges = sorted(value for value in self.bitmaps["Time Range"] if value != "∅")
+        # Clés de recherche pré-normalisées, une par Pokémon distinct, construites ici hors de la boucle
+        self.search_index = SearchIndex(self.names, TRANSLATIONS)
+
+def group_rows(store, column):
+    """Lignes regroupées par code de valeur, dans l'ordre du fichier (colonne absente : toutes les lignes sont vides)"""
+    codes = store.column_codes(column)
+    if codes is None:
+        return {0: list(range(store.row_count))} if store.row_count else {}
+    groups = {}
+    for row_id, code in enumerate(codes):
+        groups.setdefault(code, []).append(row_id)
+    return groups
+
+def rows_bitmap(row_ids, row_count):
+    """Entier dont le bit i vaut 1 pour chaque ligne i de la liste"""
+    bits = bytearray((row_count + 7) // 8)
+    for row_id in row_ids:
+        bits[row_id >> 3] |= 1 << (row_id & 7)
+    return int.from_bytes(bits, "little")
+
+class StringTable:
+    """Table de chaînes : chaque valeur distincte reçoit un code, le code 0 est la cellule vide « ∅ ».
+    Un code ne change jamais tant qu'un stockage encore vivant l'utilise, ce qui permet de lire la table sans verrou.
+    compact() libère les valeurs qui ne sont plus utilisées (après un rechargement) et leurs codes sont réutilisés."""
+    
+    def __init__(self):
+        self.lock = threading.RLock()  # tenu pendant tout un encodage : compact() ne libère rien en cours de route
+        self.values = ["∅"]
+        self.codes = {"∅": 0}
+        self.free = []  # codes libérés, réutilisables
+        self.stores = weakref.WeakSet()  # stockages encodés avec cette table et encore référencés
+    
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            with self.lock:
+                code = self.codes.get(value)
+                if code is None:
+                    # La valeur est placée avant son code : un lecteur qui voit le code trouve la valeur
+                    if self.free:
+                        code = self.free.pop()
+                        self.values[code] = value
+                    else:
+                        code = len(self.values)
+                        self.values.append(value)
+                    self.codes[value] = code
+        return code
+    
+    def compact(self):
+        """Libère les valeurs qu'aucun stockage vivant n'utilise plus. Retourne le nombre de valeurs libérées.
+        Un ancien jeu encore utilisé par une commande en cours reste vivant : ses valeurs sont gardées jusqu'à la suivante."""
+        with self.lock:
+            used = {0}
+            for store in list(self.stores):
+                for codes in store.codes:
+                    used.update(codes)
+            released = 0
+            for code, value in enumerate(self.values):
+                if value is not None and code not in used:
+                    del self.codes[value]
+                    self.values[code] = None
+                    self.free.append(code)
+                    released += 1
+            return released
+    
+    def stats(self):
+        return {"strings": len(self.codes)}
+
+class SpawnColumns:
+    """Stockage colonnaire des lignes de spawn : un tableau de codes (uint32) par colonne, valeurs dans une
+    table de chaînes. Les cellules vides (None, NaN, "") sont normalisées en « ∅ » au chargement."""
+    # Index construits par SpawnDataset (le snapshot projeté fournit les siens)
+    rows_by_name = None
+    rows_by_biome = None
+    bitmaps = None
+    
+    def __init__(self, columns, codes, table, row_count):
+        self.columns = columns
+        self.column_index = {column: index for index, column in enumerate(columns)}
+        self.codes = codes
+        self.table = table
+        self.row_count = row_count
+    
+    @classmethod
+    def from_rows(cls, rows, table):
+        """Encode des lignes (dicts lus dans le fichier Excel ou le snapshot) dans la table de chaînes donnée"""
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        with table.lock:
+            codes = [array("I", (table.code(safe_field(row.get(column))) for row in rows)) for column in columns]
+            store = cls(columns, codes, table, len(rows))
+            table.stores.add(store)
+        return store
+    
+    def string(self, code):
+        return self.table.values[code]
+    
+    def column_codes(self, column):
+        index = self.column_index.get(column)
+        return self.codes[index] if index is not None else None
+    
+    def value(self, column, row, default="∅"):
+        """Valeur d'une cellule, default si la colonne n'existe pas dans ce fichier"""
+        index = self.column_index.get(column)
+        if index is None:
+            return default
+        return self.table.values[self.codes[index][row]]
+
+# Table de chaînes commune à tous les jeux de données en mémoire : les modpacks partagent la plupart des valeurs
+# (noms, biomes, raretés...), chacune n'existe qu'une fois quel que soit le nombre de fichiers chargés
+SHARED_STRINGS = StringTable()
+_dataset_generations = itertools.count(1)
+
+# Format du snapshot colonnaire : MAGIC, longueur de l'en-tête (uint32), en-tête JSON, puis sections alignées sur 8 octets.
+# Toutes les valeurs sont des chaînes déjà passées par safe_field, référencées par leur code dans la table des chaînes.
+#   strings_offsets / strings_data : table des chaînes (uint32 × n+1, UTF-8)
+#   cells : codes des cellules (uint32), colonne par colonne
+#   name_keys / name_offsets / name_rows : index nom -> lignes ; biome_* : index biome -> lignes
+MAPPED_SNAPSHOT_MAGIC = b"WPSPAWNC"
+
+class MappedSpawnSnapshot:
+    """Snapshot colonnaire ouvert en lecture seule via mmap : les tableaux sont lus sans copie,
+    seules les chaînes effectivement utilisées sont décodées (une fois par processus)"""
+    
+    def __init__(self, file):
+        with open(file, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self.mm)
+        if bytes(view[:8]) != MAPPED_SNAPSHOT_MAGIC:
+            raise ValueError("fichier qui n'est pas un snapshot colonnaire")
+        header_length, = struct.unpack_from("<I", self.mm, 8)
+        self.header = json.loads(bytes(view[12:12 + header_length]))
+        if self.header["version"] != MAPPED_SNAPSHOT_VERSION or self.header["byteorder"] != sys.byteorder:
+            raise ValueError("snapshot colonnaire d'une autre version ou d'une autre architecture")
+        sections = {name: view[offset:offset + length] for name, (offset, length) in self.header["sections"].items()}
+        
+        self.row_count = self.header["rows"]
+        self.columns = self.header["columns"]
+        self.column_index = {column: index for index, column in enumerate(self.columns)}
+        self.string_offsets = sections["strings_offsets"].cast("I")
+        self.string_data = sections["strings_data"]
+        self.cells = sections["cells"].cast("I")
+        self._strings = [None] * (len(self.string_offsets) - 1)
+        self.rows_by_name = self._index(sections, "name")
+        self.rows_by_biome = self._index(sections, "biome")
+        bitmap_size = (self.row_count + 7) // 8
+        self.bitmaps = {}
+        for i, column in enumerate(self.header["bitmap_columns"]):
+            keys = {self.string(code): index for index, code in enumerate(sections[f"bitmap_{i}_keys"].cast("I"))}
+            self.bitmaps[column] = MappedBitmaps(keys, sections[f"bitmap_{i}_words"], bitmap_size)
+    
+    def string(self, code):
+        value = self._strings[code]
+        if value is None:
+            value = str(self.string_data[self.string_offsets[code]:self.string_offsets[code + 1]], "utf-8")
+            self._strings[code] = value
+        return value
+    
+    def column_codes(self, column):
+        index = self.column_index.get(column)
+        if index is None:
+            return None
+        return self.cells[index * self.row_count:(index + 1) * self.row_count]
+    
+    def value(self, column, row, default="∅"):
+        """Valeur d'une cellule, default si la colonne n'existe pas dans ce fichier"""
+        index = self.column_index.get(column)
+        if index is None:
+            return default
+        return self.string(self.cells[index * self.row_count + row])
+    
+    def _index(self, sections, prefix):
+        # Listes de lignes : tranches du tableau projeté, pas de copie
+        keys = sections[f"{prefix}_keys"].cast("I")
+        offsets = sections[f"{prefix}_offsets"].cast("I")
+        rows = sections[f"{prefix}_rows"].cast("I")
+        return {self.string(code): rows[offsets[i]:offsets[i + 1]] for i, code in enumerate(keys)}
+
+class MappedBitmaps(Mapping):
+    """Bitmaps d'une colonne filtrable dans le snapshot projeté (valeur -> entier dont le bit i = ligne i).
+    Les octets restent dans le fichier partagé entre processus : l'entier est reconstruit à chaque lecture."""
+    
+    def __init__(self, keys, words, size):
+        self.keys_index = keys  # valeur -> position du bitmap dans words
+        self.words = words
+        self.size = size        # octets par bitmap
+    
+    def __getitem__(self, value):
+        index = self.keys_index[value]
+        return int.from_bytes(self.words[index * self.size:(index + 1) * self.size], "little")
+    
+    def __contains__(self, value):
+        return value in self.keys_index
+    
+    def __iter__(self):
+        return iter(self.keys_index)
+    
+    def __len__(self):
+        return len(self.keys_index)
+
+class RowView:
+    """Vue légère sur une ligne d'un stockage colonnaire, pour le rendu : même interface de lecture qu'un dict,
+    les valeurs sont des chaînes déjà normalisées (« ∅ » pour une cellule vide, default pour une colonne absente)"""
+    __slots__ = ("store", "index")
+    
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+    
+    def get(self, column, default="∅"):
+        return self.store.value(column, self.index, default)
+    
+    def __getitem__(self, column):
+        if column not in self.store.column_index:
+            raise KeyError(column)
+        return self.store.value(column, self.index)
+
+class RowViews:
+    """Séquence des lignes d'un stockage colonnaire, sous forme de RowView créées à la demande"""
+    
+    def __init__(self, store):
+        self.store = store
+    
+    def __len__(self):
+        return self.store.row_count
+    
+    def __getitem__(self, index):
+        if not 0 <= index < self.store.row_count:
+            raise IndexError(index)
+        return RowView(self.store, index)
+    
+    def __iter__(self):
+        return (RowView(self.store, index) for index in range(self.store.row_count))
 
-if GUILD_ID == 0:
-    logging.error("❌ DISCORD_GUILD_ID n'est pas défini. Vérifie tes variables d'environnement.")
-    exit(1)
+# Jeux de données chargés, par fichier Excel. Le jeu par défaut (EXCEL_FILE) est chargé au démarrage,
+# les autres au premier appel d'un serveur qui les utilise.
+DATASETS = {}
+_dataset_load_locks = {}
+_dataset_load_locks_guard = threading.Lock()
+spawn_data_watcher_started = False
+translation_resolver_started = False
+metrics_server_started = False
+commands_synced = False
+_journal_lock = threading.RLock()
+_journal_entries = 0
+
+class TranslationSnapshot:
+    """Vue immuable du cache de traductions, partagée sans verrou entre le préchargement et les commandes.
+    Ne jamais modifier un snapshot publié : les écrivains en publient un nouveau via with_updates."""
+    __slots__ = ("translations", "undefined", "failures", "reverse", "lowered", "version")
+    
+    def __init__(self, translations, undefined, reverse, lowered, version, failures=None):
+        self.translations = translations  # nom original -> {langue: nom traduit}
+        self.undefined = undefined        # nom original -> {langue: None ou traduction manuelle}
+        self.failures = failures or {}    # nom original -> {"attempts": échecs consécutifs, "retry_at": horodatage}
+        self.reverse = reverse            # langue -> {nom traduit en minuscules: nom original}
+        self.lowered = lowered            # langue -> {nom original: nom traduit en minuscules}
+        self.version = version
+    
+    @classmethod
+    def build(cls, translations, undefined, version=0, failures=None):
+        """Construit un snapshot complet et ses index dérivés"""
+        reverse = {lang: {} for lang in LANGUAGES.keys()}
+        lowered = {lang: {} for lang in LANGUAGES.keys()}
+        for key, names in translations.items():
+            cls._index_names(reverse, lowered, key, names)
+        return cls(translations, undefined, reverse, lowered, version, failures)
+    
+    @staticmethod
+    def _index_names(reverse, lowered, key, names):
+        for lang, name in names.items():
+            if name is not None and lang in reverse:
+                reverse[lang][name.lower()] = key
+                lowered[lang][key] = name.lower()
+    
+    def with_updates(self, translation_updates, undefined_updates, failure_updates=None):
+        """Copie sur écriture : renvoie un nouveau snapshot avec les entrées ajoutées.
+        Seules les entrées modifiées sont réindexées. Un échec à None efface celui du Pokémon."""
+        translations = dict(self.translations)
+        for key, names in translation_updates.items():
+            translations[key] = {**translations.get(key, {}), **names}
+        undefined = dict(self.undefined)
+        for key, names in undefined_updates.items():
+            undefined[key] = {**undefined.get(key, {}), **names}
+        failures = dict(self.failures)
+        for key, failure in (failure_updates or {}).items():
+            if failure is None:
+                failures.pop(key, None)
+            else:
+                failures[key] = failure
+        
+        changed_langs = {lang for names in translation_updates.values() for lang in names}
+        reverse = {lang: dict(index) if lang in changed_langs else index for lang, index in self.reverse.items()}
+        lowered = {lang: dict(index) if lang in changed_langs else index for lang, index in self.lowered.items()}
+        for key in translation_updates:
+            self._index_names(reverse, lowered, key, translations[key])
+        return TranslationSnapshot(translations, undefined, reverse, lowered, self.version + 1, failures)
+    
+    def translation_due(self, pokemon_name, now=None):
+        """Vrai si le Pokémon doit être (re)demandé à PokeAPI : une des langues de LANGUAGES n'est ni traduite
+        ni traduite à la main (ancien cache français seul, langue ajoutée au catalogue...), et aucun échec récent
+        n'a de délai de nouvelle tentative qui court encore"""
+        translations = self.translations.get(pokemon_name) or {}
+        manual = self.undefined.get(pokemon_name) or {}
+        if all(translations.get(lang) or manual.get(lang) for lang in LANGUAGES):
+            return False
+        failure = self.failures.get(pokemon_name)
+        # Les entrées undefined d'avant les délais de nouvelle tentative n'ont pas d'échec daté : elles sont retentées
+        return failure is None or failure["retry_at"] <= (now if now is not None else time.time())
 
-spawn_data = []
+# Snapshot courant : les lecteurs prennent une seule référence, les écrivains la remplacent d'un bloc
+TRANSLATIONS = TranslationSnapshot.build({}, {})
+# Entrées en attente de publication (protégées par _journal_lock)
+_pending_translation_updates = {}
+_pending_undefined_updates = {}
+_pending_failure_updates = {}
 
 def load_translations_cache():
-    """Charge le cache des traductions existant ou crée un nouveau fichier"""
-    global TRANSLATIONS_CACHE, UNDEFINED_TRANSLATIONS, REVERSE_TRANSLATIONS
+    """Charge le cache des traductions existant (snapshot JSON puis rejeu du journal)"""
+    global TRANSLATIONS, _journal_entries
+    translations = {}
+    undefined = {}
+    failures = {}
     try:
         if os.path.exists(TRANSLATIONS_CACHE_FILE):
             with open(TRANSLATIONS_CACHE_FILE, 'r', encoding='utf-8') as f:
@@ -95,51 +586,176 @@ def load_translations_cache():
                 if isinstance(data, dict):
                     if "translations" in data:
                         # Nouveau format multi-langues
-                        TRANSLATIONS_CACHE = data.get("translations", {})
-                        UNDEFINED_TRANSLATIONS = data.get("undefined_translations", {})
+                        translations = data.get("translations", {})
+                        undefined = data.get("undefined_translations", {})
+                        failures = data.get("translation_failures", {})
                     else:
                         # Conversion de l'ancien format (français uniquement) vers le nouveau format
-                        new_translations = {}
                         for key, value in data.items():
-                            new_translations[key] = {"fr": value}
-                        TRANSLATIONS_CACHE = new_translations
-                        UNDEFINED_TRANSLATIONS = {}
-                
-            # Initialiser le dictionnaire inverse pour chaque langue
-            REVERSE_TRANSLATIONS = {lang: {} for lang in LANGUAGES.keys()}
-            for key, translations in TRANSLATIONS_CACHE.items():
-                for lang, name in translations.items():
-                    if name is not None and lang in REVERSE_TRANSLATIONS:
-                        REVERSE_TRANSLATIONS[lang][name.lower()] = key
-            
-            logging.info(f"Cache de traductions chargé: {len(TRANSLATIONS_CACHE)} entrées standard, {len(UNDEFINED_TRANSLATIONS)} entrées undefined")
+                            translations[key] = {"fr": value}
         else:
             logging.info("Aucun cache de traductions existant, un nouveau sera créé")
-            # Initialiser des dictionnaires vides
-            TRANSLATIONS_CACHE = {}
-            UNDEFINED_TRANSLATIONS = {}
-            REVERSE_TRANSLATIONS = {lang: {} for lang in LANGUAGES.keys()}
     except Exception as e:
         logging.error(f"Erreur lors du chargement du cache de traductions: {e}")
-        # En cas d'erreur, initialiser des dictionnaires vides
-        TRANSLATIONS_CACHE = {}
-        UNDEFINED_TRANSLATIONS = {}
-        REVERSE_TRANSLATIONS = {lang: {} for lang in LANGUAGES.keys()}
+        # En cas d'erreur, repartir de dictionnaires vides
+        translations = {}
+        undefined = {}
+        failures = {}
+    
+    # Rejouer les ajouts enregistrés depuis le dernier snapshot
+    _journal_entries, journal_damaged = replay_translations_journal(translations, undefined, failures)
+    
+    with _journal_lock:
+        _pending_translation_updates.clear()
+        _pending_undefined_updates.clear()
+        _pending_failure_updates.clear()
+        TRANSLATIONS = TranslationSnapshot.build(translations, undefined, TRANSLATIONS.version + 1, failures)
+    
+    logging.info(f"Cache de traductions chargé: {len(translations)} entrées standard, {len(undefined)} entrées undefined, {_journal_entries} entrées rejouées depuis le journal")
+    
+    # Compacter dès le démarrage si le journal est trop long ou abîmé (sinon les prochains ajouts suivraient une ligne tronquée)
+    if journal_damaged or _journal_entries >= JOURNAL_COMPACT_THRESHOLD:
+        save_translations_cache()
 
-def save_translations_cache():
-    """Sauvegarde le cache des traductions dans un fichier JSON"""
+def replay_translations_journal(translations, undefined, failures):
+    """Applique les entrées du journal (JSONL) aux dictionnaires donnés.
+    Retourne le nombre d'entrées lues et si des lignes illisibles ont été rencontrées."""
+    if not os.path.exists(TRANSLATIONS_JOURNAL_FILE):
+        return 0, False
+    
+    count = 0
+    damaged = False
+    with open(TRANSLATIONS_JOURNAL_FILE, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Ligne tronquée par un arrêt brutal pendant l'écriture : on l'ignore
+                logging.warning(f"Ligne {line_number} du journal de traductions illisible, ignorée")
+                damaged = True
+                continue
+            
+            name = record.get("name")
+            if not name:
+                continue
+            if "translations" in record:
+                translations.setdefault(name, {}).update(record["translations"])
+            if "undefined" in record:
+                undefined.setdefault(name, {}).update(record["undefined"])
+            if "failure" in record:
+                if record["failure"] is None:
+                    failures.pop(name, None)
+                else:
+                    failures[name] = record["failure"]
+            count += 1
+    return count, damaged
+
+def append_translations_journal(record, sync=False):
+    """Ajoute une entrée au journal. À appeler avec _journal_lock tenu."""
+    global _journal_entries
     try:
-        # Préparer les données dans le format multi-langues
-        cache_data = {
-            "translations": TRANSLATIONS_CACHE,
-            "undefined_translations": UNDEFINED_TRANSLATIONS
-        }
-        
-        with open(TRANSLATIONS_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
-        logging.info(f"Cache de traductions sauvegardé: {len(TRANSLATIONS_CACHE)} entrées standard, {len(UNDEFINED_TRANSLATIONS)} entrées undefined")
+        with open(TRANSLATIONS_JOURNAL_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        _journal_entries += 1
     except Exception as e:
-        logging.error(f"Erreur lors de la sauvegarde du cache de traductions: {e}")
+        logging.error(f"Erreur lors de l'écriture dans le journal de traductions: {e}")
+
+def next_translation_failure(original_name):
+    """Échec suivant d'un Pokémon : délai de nouvelle tentative doublé à chaque échec. À appeler avec _journal_lock tenu."""
+    previous = _pending_failure_updates.get(original_name) or TRANSLATIONS.failures.get(original_name)
+    attempts = previous["attempts"] + 1 if previous else 1
+    delay = min(UNDEFINED_RETRY_BASE * 2 ** (attempts - 1), UNDEFINED_RETRY_MAX)
+    return {"attempts": attempts, "retry_at": round(time.time() + delay)}
+
+def store_translations(original_name, translations, sync=False):
+    """Enregistre les traductions d'un Pokémon dans le journal et le lot en attente de publication.
+    Les langues que PokeAPI ne fournit pas sont marquées undefined et retentées plus tard."""
+    with _journal_lock:
+        _pending_translation_updates.setdefault(original_name, {}).update(translations)
+        record = {"name": original_name, "translations": translations}
+        known = {**TRANSLATIONS.translations.get(original_name, {}), **_pending_translation_updates[original_name]}
+        manual = {**TRANSLATIONS.undefined.get(original_name, {}), **_pending_undefined_updates.get(original_name, {})}
+        missing = {lang: None for lang in LANGUAGES if not known.get(lang) and not manual.get(lang)}
+        if missing:
+            failure = next_translation_failure(original_name)
+            _pending_undefined_updates.setdefault(original_name, {}).update(missing)
+            _pending_failure_updates[original_name] = failure
+            record["undefined"] = missing
+            record["failure"] = failure
+        elif _pending_failure_updates.get(original_name) or original_name in TRANSLATIONS.failures:
+            # Toutes les langues sont traduites : l'échec précédent est effacé
+            _pending_failure_updates[original_name] = None
+            record["failure"] = None
+        append_translations_journal(record, sync)
+    maybe_compact_translations_cache()
+
+def store_undefined_translation(original_name, lang, sync=False):
+    """Marque une traduction comme introuvable et programme la prochaine tentative (délai doublé à chaque échec),
+    dans le journal et le lot en attente de publication. Retourne l'échec enregistré."""
+    with _journal_lock:
+        failure = next_translation_failure(original_name)
+        _pending_undefined_updates.setdefault(original_name, {})[lang] = None
+        _pending_failure_updates[original_name] = failure
+        append_translations_journal({"name": original_name, "undefined": {lang: None}, "failure": failure}, sync)
+    maybe_compact_translations_cache()
+    return failure
+
+def publish_translations():
+    """Publie le lot de traductions en attente dans un nouveau snapshot, de manière atomique"""
+    global TRANSLATIONS
+    with _journal_lock:
+        if not _pending_translation_updates and not _pending_undefined_updates and not _pending_failure_updates:
+            return TRANSLATIONS
+        previous = TRANSLATIONS
+        TRANSLATIONS = TRANSLATIONS.with_updates(_pending_translation_updates, _pending_undefined_updates, _pending_failure_updates)
+        # Sous le verrou : les index passent les versions dans l'ordre, en ne recalculant que le lot
+        update_search_indexes(previous, TRANSLATIONS, {*_pending_translation_updates, *_pending_undefined_updates})
+        _pending_translation_updates.clear()
+        _pending_undefined_updates.clear()
+        _pending_failure_updates.clear()
+        return TRANSLATIONS
+
+def maybe_compact_translations_cache():
+    """Compacte le journal dans le snapshot JSON quand il devient trop long"""
+    if _journal_entries >= JOURNAL_COMPACT_THRESHOLD:
+        save_translations_cache()
+
+def save_translations_cache():
+    """Écrit un snapshot complet du cache de manière atomique puis vide le journal"""
+    global _journal_entries
+    with _journal_lock:
+        try:
+            # Le fichier doit contenir tout ce qui est déjà dans le journal, y compris le lot non publié
+            snapshot = publish_translations()
+            
+            # Préparer les données dans le format multi-langues
+            cache_data = {
+                "translations": snapshot.translations,
+                "undefined_translations": snapshot.undefined,
+                "translation_failures": snapshot.failures
+            }
+            
+            # Écrire dans un fichier temporaire puis le renommer : le snapshot n'est jamais à moitié écrit
+            tmp_file = f"{TRANSLATIONS_CACHE_FILE}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, TRANSLATIONS_CACHE_FILE)
+            
+            # Le snapshot contient tout le journal, qui peut repartir de zéro
+            with open(TRANSLATIONS_JOURNAL_FILE, 'w', encoding='utf-8'):
+                pass
+            _journal_entries = 0
+            logging.info(f"Cache de traductions compacté: {len(snapshot.translations)} entrées standard, {len(snapshot.undefined)} entrées undefined")
+        except Exception as e:
+            logging.error(f"Erreur lors de la sauvegarde du cache de traductions: {e}")
 
 def normalize_pokemon_name(name):
     """Extrait le nom de base du Pokémon et les features"""
@@ -172,6 +788,10 @@ def normalize_pokemon_name(name):
     # Cas par défaut: retourner le nom sans modifications
     return (name, None)
 
+def pokeapi_species_name(normalized_name):
+    """Identifiant PokeAPI d'une espèce à partir du nom normalisé (ex. « Mr. Mime » -> « mr.-mime »)"""
+    return normalized_name.lower().replace(' ', '-').replace("'", "")
+
 def get_pokemon_name(pokemon_name, lang="fr", max_retries=3, force_save=False):
     """Obtient le nom du Pokémon dans la langue spécifiée"""
     if not pokemon_name:
@@ -190,11 +810,15 @@ def get_pokemon_name(pokemon_name, lang="fr", max_retries=3, force_save=False):
     normalized_name, regional_form = normalize_pokemon_name(pokemon_name)
     
     # Format spécifique pour l'API
-    api_name = normalized_name.lower().replace(' ', '-').replace("'", "")
+    api_name = pokeapi_species_name(normalized_name)
+    
+    # Lire le snapshot courant une seule fois
+    snapshot = TRANSLATIONS
     
-    # Vérifier le cache pour ce Pokémon avec le nom original
-    if original_name in TRANSLATIONS_CACHE and lang in TRANSLATIONS_CACHE[original_name]:
-        translated_name = TRANSLATIONS_CACHE[original_name][lang]
+    # Vérifier le cache pour ce Pokémon avec le nom original (sauf s'il manque d'autres langues à demander)
+    if (original_name in snapshot.translations and lang in snapshot.translations[original_name]
+            and not snapshot.translation_due(original_name)):
+        translated_name = snapshot.translations[original_name][lang]
         
         # Construire le nom complet avec forme régionale et/ou features
         result_name = translated_name
@@ -206,10 +830,10 @@ def get_pokemon_name(pokemon_name, lang="fr", max_retries=3, force_save=False):
         return result_name
     
     # Vérifier si déjà essayé et ne donnant pas de résultat
-    if original_name in UNDEFINED_TRANSLATIONS:
-        if lang in UNDEFINED_TRANSLATIONS[original_name] and UNDEFINED_TRANSLATIONS[original_name][lang] is not None:
+    if original_name in snapshot.undefined:
+        if lang in snapshot.undefined[original_name] and snapshot.undefined[original_name][lang] is not None:
             # Si une traduction manuelle a été fournie, l'utiliser
-            translated_name = UNDEFINED_TRANSLATIONS[original_name][lang]
+            translated_name = snapshot.undefined[original_name][lang]
             result_name = translated_name
             if regional_form:
                 result_name = f"{result_name} {REGIONAL_FORMS[regional_form][lang]}"
@@ -217,33 +841,22 @@ def get_pokemon_name(pokemon_name, lang="fr", max_retries=3, force_save=False):
                 result_name = f"{result_name} ({features})"
             return result_name
         
-        # Sinon utiliser le nom original
-        logging.info(f"Utilisant le nom original pour {original_name} (précédemment undefined)")
-        result_name = normalized_name
-        if regional_form:
-            result_name = f"{result_name} {REGIONAL_FORMS[regional_form][lang]}"
-        if features:
-            result_name = f"{result_name} ({features})"
-        
-        return result_name
+        # Sinon utiliser le nom original, jusqu'à la prochaine tentative programmée
+        if not snapshot.translation_due(original_name):
+            logging.info(f"Utilisant le nom original pour {original_name} (précédemment undefined)")
+            result_name = normalized_name
+            if regional_form:
+                result_name = f"{result_name} {REGIONAL_FORMS[regional_form][lang]}"
+            if features:
+                result_name = f"{result_name} ({features})"
+            
+            return result_name
     
     # Essayer l'API avec le nom tel quel
     translations = try_api_request(api_name, max_retries)
     if translations:
-        # Initialiser l'entrée dans le cache si elle n'existe pas
-        if original_name not in TRANSLATIONS_CACHE:
-            TRANSLATIONS_CACHE[original_name] = {}
-        
-        # Stocker toutes les traductions obtenues
-        for language, name in translations.items():
-            TRANSLATIONS_CACHE[original_name][language] = name
-            
-            # Mettre à jour les dictionnaires inverses
-            if name is not None and language in REVERSE_TRANSLATIONS:
-                REVERSE_TRANSLATIONS[language][name.lower()] = original_name
-        
-        if force_save:
-            save_translations_cache()  # Forcer la sauvegarde immédiate
+        # Stocker toutes les traductions obtenues (ajout au journal)
+        store_translations(original_name, translations, sync=force_save)
         
         # Construire le nom complet dans la langue demandée
         if lang in translations and translations[lang]:
@@ -262,20 +875,8 @@ def get_pokemon_name(pokemon_name, lang="fr", max_retries=3, force_save=False):
             if translations:
                 logging.info(f"Nom trouvé avec tiret: {test_name}")
                 
-                # Initialiser l'entrée dans le cache si elle n'existe pas
-                if original_name not in TRANSLATIONS_CACHE:
-                    TRANSLATIONS_CACHE[original_name] = {}
-                
-                # Stocker toutes les traductions obtenues
-                for language, name in translations.items():
-                    TRANSLATIONS_CACHE[original_name][language] = name
-                    
-                    # Mettre à jour les dictionnaires inverses
-                    if name is not None and language in REVERSE_TRANSLATIONS:
-                        REVERSE_TRANSLATIONS[language][name.lower()] = original_name
-                
-                if force_save:
-                    save_translations_cache()  # Forcer la sauvegarde immédiate
+                # Stocker toutes les traductions obtenues (ajout au journal)
+                store_translations(original_name, translations, sync=force_save)
                 
                 # Construire le nom complet dans la langue demandée
                 if lang in translations and translations[lang]:
@@ -293,20 +894,8 @@ def get_pokemon_name(pokemon_name, lang="fr", max_retries=3, force_save=False):
         if translations:
             logging.info(f"Nom trouvé avec partie de base: {base_part}")
             
-            # Initialiser l'entrée dans le cache si elle n'existe pas
-            if original_name not in TRANSLATIONS_CACHE:
-                TRANSLATIONS_CACHE[original_name] = {}
-            
-            # Stocker toutes les traductions obtenues
-            for language, name in translations.items():
-                TRANSLATIONS_CACHE[original_name][language] = name
-                
-                # Mettre à jour les dictionnaires inverses
-                if name is not None and language in REVERSE_TRANSLATIONS:
-                    REVERSE_TRANSLATIONS[language][name.lower()] = original_name
-            
-            if force_save:
-                save_translations_cache()  # Forcer la sauvegarde immédiate
+            # Stocker toutes les traductions obtenues (ajout au journal)
+            store_translations(original_name, translations, sync=force_save)
             
             # Construire le nom complet dans la langue demandée
             if lang in translations and translations[lang]:
@@ -321,14 +910,10 @@ def get_pokemon_name(pokemon_name, lang="fr", max_retries=3, force_save=False):
                         result_name = f"{result_name} ({extra_part})"
                 return result_name
     
-    # Si tout échoue, marquer comme undefined et utiliser le nom original
-    logging.warning(f"Impossible de trouver une traduction pour {original_name}")
-    if original_name not in UNDEFINED_TRANSLATIONS:
-        UNDEFINED_TRANSLATIONS[original_name] = {}
-    UNDEFINED_TRANSLATIONS[original_name][lang] = None
-    
-    if force_save:
-        save_translations_cache()  # Forcer la sauvegarde immédiate
+    # Si tout échoue, marquer comme undefined (nouvelle tentative programmée) et utiliser le nom original
+    failure = store_undefined_translation(original_name, lang, sync=force_save)
+    logging.warning(f"Impossible de trouver une traduction pour {original_name} "
+                    f"(échec n°{failure['attempts']}, nouvel essai après {time.strftime('%Y-%m-%d %H:%M', time.localtime(failure['retry_at']))})")
     
     # Construire le nom complet avec features même si pas de traduction
     result_name = normalized_name
@@ -339,14 +924,295 @@ def get_pokemon_name(pokemon_name, lang="fr", max_retries=3, force_save=False):
     
     return result_name
 
+def format_pokemon_name(base_name, regional_form, features, lang):
+    """Construit le nom complet avec forme régionale et/ou features"""
+    result_name = base_name
+    if regional_form:
+        result_name = f"{result_name} {REGIONAL_FORMS[regional_form][lang]}"
+    if features:
+        result_name = f"{result_name} ({features})"
+    return result_name
+
+def fold_search_text(text):
+    """Forme de comparaison d'un texte : minuscules, sans accents (é -> e), caractères pleine chasse unifiés.
+    Les marques de voisement japonaises (dakuten) sont gardées : ガ et カ restent distincts."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return unicodedata.normalize("NFC", "".join(c for c in decomposed if not unicodedata.combining(c) or c in "\u3099\u309a"))
+
+class SearchIndex:
+    """Clés de recherche des Pokémon d'un jeu de données, alignées sur la liste des noms : nom original normalisé,
+    forme régionale et features analysées une fois au chargement. Les clés traduites de chaque langue sont
+    construites au chargement, puis mises à jour à chaque publication de traductions pour les seuls Pokémon
+    du lot, par le thread qui publie : les commandes ne font que les lire."""
+    
+    def __init__(self, names, snapshot=None):
+        self.names = names
+        self.positions = {name: position for position, name in enumerate(names)}
+        self.originals = [fold_search_text(name) for name in names]
+        self.bases = []
+        self.regional_forms = []
+        self.features = []
+        for name in names:
+            base_name, regional_form = normalize_pokemon_name(name)
+            feature_match = re.search(r'\s+[^a-zA-Z0-9\s]', name)
+            self.bases.append(base_name)
+            self.regional_forms.append(regional_form)
+            self.features.append(name[feature_match.start():].strip() if feature_match else "")
+        self.lock = threading.Lock()
+        self._by_lang = {}  # langue -> (version du snapshot, noms traduits, noms affichés), jamais modifiés en place
+        if snapshot is not None:
+            for lang in LANGUAGE_PACKS:
+                self._store(lang, self._build(lang, snapshot))
+    
+    def _keys(self, position, lang, snapshot):
+        """Nom traduit (None si absent du cache) et nom affiché complet, avec forme régionale et features,
+        tel que le construit get_cached_pokemon_name"""
+        name = self.names[position]
+        translated_name = snapshot.lowered.get(lang, {}).get(name)
+        display_name = ((snapshot.translations.get(name) or {}).get(lang)
+                        or (snapshot.undefined.get(name) or {}).get(lang) or self.bases[position])
+        return (fold_search_text(translated_name) if translated_name is not None else None,
+                fold_search_text(format_pokemon_name(display_name, self.regional_forms[position], self.features[position], lang)))
+    
+    def _build(self, lang, snapshot):
+        translated = []
+        displayed = []
+        for position in range(len(self.names)):
+            translated_key, displayed_key = self._keys(position, lang, snapshot)
+            translated.append(translated_key)
+            displayed.append(displayed_key)
+        return (snapshot.version, translated, displayed)
+    
+    def _store(self, lang, keys):
+        """Remplace les clés d'une langue, sauf si une version plus récente est déjà en place"""
+        with self.lock:
+            current = self._by_lang.get(lang)
+            if current is None or current[0] <= keys[0]:
+                self._by_lang[lang] = current = keys
+            return current
+    
+    def translated(self, lang, snapshot):
+        """Clés traduites d'une langue, au moins aussi récentes que le snapshot"""
+        keys = self._by_lang.get(lang)
+        if keys is not None and keys[0] >= snapshot.version:
+            return keys
+        # Index en retard (langue jamais demandée, jeu chargé pendant une publication) : reconstruction complète
+        return self._store(lang, self._build(lang, snapshot))
+    
+    def publish(self, previous, snapshot, changed_names):
+        """Passe les clés de previous à snapshot en ne recalculant que les Pokémon modifiés (copie sur écriture)"""
+        positions = [self.positions[name] for name in changed_names if name in self.positions]
+        for lang, keys in list(self._by_lang.items()):
+            if keys[0] >= snapshot.version:
+                continue
+            if keys[0] < previous.version:
+                # Des publications ont été manquées : reconstruction complète, toujours hors de la boucle
+                self._store(lang, self._build(lang, snapshot))
+                continue
+            translated = list(keys[1])
+            displayed = list(keys[2])
+            for position in positions:
+                translated[position], displayed[position] = self._keys(position, lang, snapshot)
+            self._store(lang, (snapshot.version, translated, displayed))
+
+def update_search_indexes(previous, snapshot, changed_names):
+    """Répercute une publication de traductions sur les index de recherche des jeux chargés"""
+    for dataset in list(DATASETS.values()):
+        try:
+            dataset.search_index.publish(previous, snapshot, changed_names)
+        except Exception as e:
+            logging.error(f"Erreur lors de la mise à jour de l'index de recherche de {dataset.path}: {e}")
+
+# File des traductions manquantes, résolues par un thread dédié hors de la boucle Discord
+_translation_queue = queue.Queue()
+_pending_translations = set()
+_pending_lock = threading.Lock()
+_translation_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="translation")
+
+def get_cached_pokemon_name(pokemon_name, lang="fr"):
+    """Version non bloquante de get_pokemon_name : n'utilise que le cache.
+    En cas d'absence, renvoie immédiatement le nom original et met la traduction en file."""
+    if not pokemon_name:
+        return pokemon_name
+
+    features = ""
+    feature_match = re.search(r'\s+[^a-zA-Z0-9\s]', pokemon_name)
+    if feature_match:
+        features = pokemon_name[feature_match.start():].strip()
+    normalized_name, regional_form = normalize_pokemon_name(pokemon_name)
+
+    snapshot = TRANSLATIONS
+    translations = snapshot.translations.get(pokemon_name)
+    if translations is not None and translations.get(lang):
+        METRICS.inc("translation_cache_lookups_total", lang=lang, result="hit")
+        return format_pokemon_name(translations[lang], regional_form, features, lang)
+
+    undefined = snapshot.undefined.get(pokemon_name)
+    if undefined is not None and undefined.get(lang):
+        # Traduction manuelle fournie dans undefined_translations
+        METRICS.inc("translation_cache_lookups_total", lang=lang, result="hit")
+        return format_pokemon_name(undefined[lang], regional_form, features, lang)
+
+    METRICS.inc("translation_cache_lookups_total", lang=lang, result="miss")
+    if snapshot.translation_due(pokemon_name):
+        queue_translation(pokemon_name)
+    return format_pokemon_name(normalized_name, regional_form, features, lang)
+
+def queue_translation(pokemon_name):
+    """Ajoute un Pokémon à la file de résolution en arrière-plan (sans doublon)"""
+    with _pending_lock:
+        if pokemon_name in _pending_translations:
+            return
+        _pending_translations.add(pokemon_name)
+    _translation_queue.put(pokemon_name)
+
+def translation_resolver_worker():
+    """Résout les traductions mises en file par les commandes, une par une"""
+    while True:
+        pokemon_name = _translation_queue.get()
+        try:
+            # Une requête récupère toutes les langues à la fois
+            get_pokemon_name(pokemon_name, "fr")
+            publish_translations()
+        except Exception as e:
+            logging.error(f"Erreur lors de la résolution en arrière-plan de {pokemon_name}: {e}")
+        finally:
+            with _pending_lock:
+                _pending_translations.discard(pokemon_name)
+            _translation_queue.task_done()
+
+def start_translation_resolver():
+    """Démarre le thread de résolution des traductions manquantes"""
+    threading.Thread(target=translation_resolver_worker, name="translation-resolver", daemon=True).start()
+
+async def resolve_pokemon_names(pokemon_names, lang="fr", timeout=None):
+    """Attend la traduction des noms manquants dans un exécuteur, dans la limite d'un budget de temps.
+    Les requêtes qui dépassent le budget continuent en arrière-plan et serviront à la prochaine commande."""
+    if timeout is None:
+        timeout = TRANSLATION_LOOKUP_TIMEOUT
+    snapshot = TRANSLATIONS
+    missing = [name for name in set(pokemon_names) if name and snapshot.translation_due(name)]
+    if not missing or timeout <= 0:
+        return
+
+    loop = asyncio.get_running_loop()
+    futures = [loop.run_in_executor(_translation_executor, get_pokemon_name, name, lang) for name in missing]
+    done, pending = await asyncio.wait(futures, timeout=timeout)
+    if done:
+        # La publication met aussi à jour les index de recherche : hors de la boucle
+        await loop.run_in_executor(None, publish_translations)
+    if pending:
+        logging.info(f"{len(pending)} traduction(s) non résolue(s) dans le budget de {timeout}s, noms originaux utilisés")
+
+_pokeapi_session = None
+_pokeapi_session_lock = threading.Lock()
+
+def pokeapi_session():
+    """Session HTTP unique pour PokeAPI : keep-alive et pool de connexions partagés par tous les threads"""
+    global _pokeapi_session
+    with _pokeapi_session_lock:
+        if _pokeapi_session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=8)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = "wheresmycobblemon-bot"
+            _pokeapi_session = session
+        return _pokeapi_session
+
+class HttpCache:
+    """Cache disque des réponses HTTP (un fichier JSON par URL), écrit de manière atomique"""
+    
+    def __init__(self, directory):
+        self.directory = directory
+    
+    def path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+    
+    def get(self, url):
+        if not self.directory:
+            return None
+        try:
+            with open(self.path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry if entry.get("url") == url else None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Entrée du cache HTTP illisible pour {url}, ignorée: {e}")
+            return None
+    
+    def put(self, entry):
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self.path(entry["url"])
+            tmp_file = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_file, path)
+        except Exception as e:
+            # Disque plein ou dossier en lecture seule : on continue sans cache
+            logging.warning(f"Impossible d'écrire dans le cache HTTP: {e}")
+
+HTTP_CACHE = HttpCache(HTTP_CACHE_DIR)
+
+def response_max_age(response):
+    """Durée de fraîcheur annoncée par Cache-Control (max-age), sinon la valeur par défaut"""
+    match = re.search(r'max-age=(\d+)', response.headers.get("Cache-Control", ""))
+    return int(match.group(1)) if match else HTTP_CACHE_DEFAULT_MAX_AGE
+
+def cached_get(url):
+    """GET via la session partagée et le cache disque. Retourne (code HTTP, contenu JSON ou None).
+    Une réponse fraîche est servie sans réseau ; une réponse périmée est revalidée (304 = contenu réutilisé)
+    et reste servie si PokeAPI est injoignable."""
+    entry = HTTP_CACHE.get(url)
+    now = time.time()
+    if entry and now < entry["stored_at"] + entry["max_age"]:
+        METRICS.inc("pokeapi_cache_total", result="hit")
+        return entry["status"], entry["data"]
+    
+    headers = {}
+    if entry and entry["status"] == 200:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    try:
+        response = pokeapi_session().get(url, headers=headers, timeout=HTTP_TIMEOUT)
+    except Exception:
+        if entry and entry["status"] == 200:
+            METRICS.inc("pokeapi_cache_total", result="stale")
+            return entry["status"], entry["data"]
+        raise
+    METRICS.inc("pokeapi_requests_total", status=str(response.status_code))
+    
+    if response.status_code == 304 and entry:
+        METRICS.inc("pokeapi_cache_total", result="revalidated")
+        entry["stored_at"] = now
+        entry["max_age"] = response_max_age(response)
+        HTTP_CACHE.put(entry)
+        return entry["status"], entry["data"]
+    
+    METRICS.inc("pokeapi_cache_total", result="miss")
+    if response.status_code == 200:
+        data = response.json()
+        HTTP_CACHE.put({"url": url, "status": 200, "stored_at": now, "max_age": response_max_age(response),
+                        "etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified"),
+                        "data": data})
+        return 200, data
+    if response.status_code == 404:
+        # Les variantes de noms essayées une à une donnent beaucoup de 404 : inutile de les redemander à chaque reconstruction
+        HTTP_CACHE.put({"url": url, "status": 404, "stored_at": now, "max_age": HTTP_CACHE_NEGATIVE_TTL, "data": None})
+    return response.status_code, None
+
 def try_api_request(api_name, max_tries=3):
     """Fonction utilitaire pour essayer une requête API avec différentes tentatives"""
     for attempt in range(max_tries):
         try:
-            response = requests.get(f"https://pokeapi.co/api/v2/pokemon-species/{api_name}")
+            status_code, data = cached_get(f"{POKEAPI_BASE_URL}/pokemon-species/{api_name}")
             
-            if response.status_code == 200:
-                data = response.json()
+            if status_code == 200:
                 # Extraire les noms dans toutes les langues demandées
                 translations = {}
                 for entry in data["names"]:
@@ -356,123 +1222,598 @@ def try_api_request(api_name, max_tries=3):
                         if lang_code == api_lang:
                             translations[our_lang] = entry["name"]
                 return translations
-            elif response.status_code == 404:
+            elif status_code == 404:
                 return None  # Pokémon non trouvé
             else:
                 # Autre erreur HTTP, attendre et réessayer
+                METRICS.inc("pokeapi_errors_total", reason="http")
                 time.sleep(1)
         except Exception as e:
+            METRICS.inc("pokeapi_errors_total", reason="exception")
             time.sleep(1)
     
     return None  # Échec après toutes les tentatives
 
-def preload_all_pokemon_translations():
-    """Précharge toutes les traductions des Pokémon présents dans les données"""
-    logging.info("Préchargement des traductions de tous les Pokémon...")
+def species_key(pokemon_name):
+    """Espèce PokeAPI d'un nom original : « Vulpix », « Alolan Vulpix » et « Vulpix [Shiny] » partagent la même requête"""
+    normalized_name, _ = normalize_pokemon_name(pokemon_name)
+    return pokeapi_species_name(normalized_name)
+
+def known_translations(pokemon_name):
+    """Traductions d'un Pokémon, y compris celles du lot pas encore publié"""
+    with _journal_lock:
+        pending = _pending_translation_updates.get(pokemon_name)
+        if pending:
+            return {**TRANSLATIONS.translations.get(pokemon_name, {}), **pending}
+        return TRANSLATIONS.translations.get(pokemon_name)
+
+class PreloadPlanner:
+    """Plan de préchargement par espèce distincte, persisté dans PRELOAD_STATE_FILE.
+    La file et le curseur survivent à un redémarrage ; les espèces recherchées par les utilisateurs passent devant."""
     
-    # Récupérer tous les noms uniques de Pokémon
-    pokemon_to_translate = []
-    total_unique = 0
+    def __init__(self, state_file):
+        self.state_file = state_file
+        self.lock = threading.Lock()
+        self.queue = []    # espèces à traduire, dans l'ordre de traitement
+        self.cursor = 0    # position de la prochaine espèce dans la file
+        self.groups = {}   # espèce -> noms originaux à traduire
+        self.demand = {}   # espèce -> nombre de recherches qui l'ont affichée
+        self.searches = queue.SimpleQueue()  # espèces affichées par les recherches, pas encore comptées
+        self.save_lock = threading.Lock()    # sérialise les écritures, faites hors de self.lock
+        self.state_seq = 0   # numéro de la dernière copie de l'état
+        self.saved_seq = 0   # numéro de la dernière copie écrite
+        self.load()
     
-    for entry in spawn_data:
-        pokemon_name = safe_field(entry.get("Pokemon"))
-        if pokemon_name != "∅":
-            normalized_name, _ = normalize_pokemon_name(pokemon_name)
-            api_name = normalized_name.lower().replace(' ', '-').replace("'", "")
-            total_unique += 1
-            
-            # Vérifier si déjà dans le cache pour toutes les langues
-            need_translation = False
-            for lang in LANGUAGES.keys():
-                if api_name not in TRANSLATIONS_CACHE or lang not in TRANSLATIONS_CACHE[api_name]:
-                    if api_name not in UNDEFINED_TRANSLATIONS or lang not in UNDEFINED_TRANSLATIONS[api_name]:
-                        need_translation = True
-                        break
-            
-            if need_translation:
-                pokemon_to_translate.append(pokemon_name)
+    def load(self):
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.queue = state.get("queue", [])
+            self.cursor = min(state.get("cursor", 0), len(self.queue))
+            self.demand = state.get("demand", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"État du préchargement illisible, le plan sera reconstruit: {e}")
+    
+    def _state(self):
+        """Copie numérotée de la file, du curseur et des demandes. À appeler avec self.lock tenu."""
+        self.state_seq += 1
+        return self.state_seq, {"queue": list(self.queue), "cursor": self.cursor, "demand": dict(self.demand)}
+    
+    def _write(self, state):
+        """Écrit une copie de l'état (écriture atomique), hors de self.lock : une copie plus ancienne
+        que la dernière écrite est ignorée"""
+        seq, data = state
+        with self.save_lock:
+            if seq <= self.saved_seq:
+                return
+            try:
+                tmp_file = f"{self.state_file}.tmp"
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_file, self.state_file)
+                self.saved_seq = seq
+            except Exception as e:
+                logging.error(f"Erreur lors de l'enregistrement de l'état du préchargement: {e}")
+    
+    def save(self):
+        """Enregistre l'état courant, recherches en attente comprises"""
+        with self.lock:
+            self._count_searches()
+            state = self._state()
+        self._write(state)
+    
+    def note_search(self, pokemon_names):
+        """Note une recherche pour les espèces affichées. Appelé depuis la boucle Discord : ni verrou ni écriture disque,
+        les workers comptent les recherches en attente avant de choisir l'espèce suivante."""
+        self.searches.put({species_key(name) for name in set(pokemon_names) if name and name != "∅"})
+    
+    def _count_searches(self):
+        """Ajoute les recherches en attente aux demandes. À appeler avec self.lock tenu. Retourne vrai s'il y en avait."""
+        counted = False
+        while True:
+            try:
+                keys = self.searches.get_nowait()
+            except queue.Empty:
+                return counted
+            for key in keys:
+                self.demand[key] = self.demand.get(key, 0) + 1
+            counted = True
+    
+    def _sort_remaining(self):
+        # Tri stable : à demande égale, l'ordre de la file (celui des fichiers de données) est conservé
+        self.queue[self.cursor:] = sorted(self.queue[self.cursor:], key=lambda key: -self.demand.get(key, 0))
+    
+    def plan(self, pokemon_names, snapshot):
+        """Regroupe les noms à traduire par espèce et reprend la file enregistrée là où elle s'était arrêtée.
+        Retourne le nombre d'espèces à traiter."""
+        now = time.time()
+        groups = {}
+        for name in pokemon_names:
+            if snapshot.translation_due(name, now):
+                groups.setdefault(species_key(name), []).append(name)
+        with self.lock:
+            # Espèces restantes du plan précédent d'abord, puis les nouvelles ; les espèces en cours lors
+            # d'un arrêt brutal sont encore à traduire et reviennent donc dans le plan
+            remaining = list(dict.fromkeys(key for key in self.queue[self.cursor:] if key in groups))
+            planned = set(remaining)
+            remaining += [key for key in groups if key not in planned]
+            self.queue = remaining
+            self.cursor = 0
+            self.groups = groups
+            self._count_searches()
+            self._sort_remaining()
+            state = self._state()
+        self._write(state)
+        return len(remaining)
+    
+    def next_species(self):
+        """Prochaine espèce à traiter (None quand la file est vide), curseur persisté"""
+        with self.lock:
+            if self._count_searches():
+                self._sort_remaining()
+            if self.cursor >= len(self.queue):
+                return None
+            key = self.queue[self.cursor]
+            self.cursor += 1
+            state = self._state()
+        self._write(state)
+        return key
+
+PRELOAD_PLANNER = PreloadPlanner(PRELOAD_STATE_FILE)
+
+def preload_species(key, pokemon_names):
+    """Traduit une espèce : une seule série de requêtes PokeAPI, résultat recopié sur tous ses noms originaux"""
+    first_name = pokemon_names[0]
+    # On lance une traduction pour la langue française, mais ça récupérera toutes les langues
+    get_pokemon_name(first_name, "fr")
+    translations = known_translations(first_name)
+    for pokemon_name in pokemon_names[1:]:
+        if translations:
+            store_translations(pokemon_name, translations)
+        else:
+            store_undefined_translation(pokemon_name, "fr")
+
+def preload_all_pokemon_translations():
+    """Précharge les traductions des espèces présentes dans les données, avec PRELOAD_WORKERS workers"""
+    logging.info("Préchargement des traductions de tous les Pokémon...")
     
-    total = len(pokemon_to_translate)
-    processed = 0
-    logging.info(f"Nombre total de Pokémon uniques: {total_unique}, à traduire: {total}")
+    # Le cache est indexé par nom original, comme dans get_pokemon_name : un redémarrage à chaud ne fait aucun appel.
+    # Les échecs ne sont retentés qu'une fois leur délai écoulé.
+    unique_names = list(dict.fromkeys(name for dataset in list(DATASETS.values()) for name in dataset.names))
+    planner = PRELOAD_PLANNER
+    total = planner.plan(unique_names, TRANSLATIONS)
+    PRELOAD_PROGRESS.update(total=total, processed=0, running=total > 0)
+    logging.info(f"Nombre total de Pokémon uniques: {len(unique_names)}, espèces à traduire: {total}")
     
     # Sortir immédiatement si tous les Pokémon sont déjà dans le cache
     if total == 0:
         logging.info("Tous les Pokémon sont déjà traduits dans le cache, aucun appel API nécessaire.")
         return
     
-    # Précharger les traductions uniquement pour ceux qui ne sont pas dans le cache
-    for pokemon_name in pokemon_to_translate:
-        try:
-            # On lance une traduction pour la langue française, mais ça récupérera toutes les langues
-            translations = get_pokemon_name(pokemon_name, "fr")
-            processed += 1
-            
-            if processed % 10 == 0:
-                save_translations_cache()
-                logging.info(f"Traduction {processed}/{total} : {pokemon_name} (cache sauvegardé)")
-            elif processed % 5 == 0 or processed == total:
-                logging.info(f"Traduction {processed}/{total} : {pokemon_name}")
-            
-            # Délai entre les requêtes
-            time.sleep(1.0)
-        except Exception as e:
-            logging.error(f"Erreur lors de la traduction de {pokemon_name}: {e}")
-            time.sleep(5.0)  # Attendre plus longtemps en cas d'erreur
+    progress_lock = threading.Lock()
+    
+    def worker():
+        while True:
+            key = planner.next_species()
+            if key is None:
+                return
+            try:
+                preload_species(key, planner.groups[key])
+                with progress_lock:
+                    PRELOAD_PROGRESS["processed"] += 1
+                    processed = PRELOAD_PROGRESS["processed"]
+                
+                # Chaque traduction est déjà ajoutée au journal ; on publie par lots pour les commandes
+                if processed % TRANSLATION_PUBLISH_BATCH == 0:
+                    publish_translations()
+                if processed % 5 == 0 or processed == total:
+                    logging.info(f"Traduction {processed}/{total} : {key}")
+                
+                # Délai entre les requêtes
+                time.sleep(PRELOAD_DELAY)
+            except Exception as e:
+                logging.error(f"Erreur lors de la traduction de {key}: {e}")
+                time.sleep(5.0)  # Attendre plus longtemps en cas d'erreur
+    
+    workers = [threading.Thread(target=worker, name=f"preload-{i}", daemon=True) for i in range(max(1, PRELOAD_WORKERS))]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
     
-    # Sauvegarde finale
+    # Compaction finale du journal dans le snapshot
     save_translations_cache()
-    logging.info(f"Préchargement terminé. {len(TRANSLATIONS_CACHE)} traductions disponibles, {len(UNDEFINED_TRANSLATIONS)} non définies.")
+    planner.save()
+    PRELOAD_PROGRESS["running"] = False
+    snapshot = TRANSLATIONS
+    logging.info(f"Préchargement terminé. {len(snapshot.translations)} traductions disponibles, {len(snapshot.undefined)} non définies.")
 
 def async_preload_translations():
     """Lance le préchargement des traductions dans un thread séparé pour ne pas bloquer Discord"""
     threading.Thread(target=preload_all_pokemon_translations, daemon=True).start()
     logging.info("Préchargement des traductions lancé en arrière-plan")
 
-def load_spawn_data_from_excel():
-    global spawn_data
+def file_sha256(path):
+    """Calcule l'empreinte SHA-256 d'un fichier"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def spawn_snapshot_file(path):
+    """Chemin du snapshot binaire associé à un fichier Excel"""
+    return os.path.splitext(path)[0] + ".snapshot.pkl"
+
+def read_spawn_snapshot(path=None):
+    """Lit le snapshot binaire des données de spawn, ou None s'il est absent ou d'une autre version"""
     try:
-        df = pd.read_excel(EXCEL_FILE)
-        spawn_data = df.to_dict(orient="records")
-        logging.info(f"Données chargées depuis {EXCEL_FILE}. {len(spawn_data)} entrées disponibles.")
+        with open(spawn_snapshot_file(path or EXCEL_FILE), 'rb') as f:
+            snapshot = pickle.load(f)
+        if isinstance(snapshot, dict) and snapshot.get("version") == SPAWN_SNAPSHOT_VERSION:
+            return snapshot
+        logging.info("Snapshot des données de spawn d'une ancienne version, il sera régénéré")
+    except FileNotFoundError:
+        pass
     except Exception as e:
-        logging.error(f"Erreur lors du chargement du fichier Excel: {e}")
-        spawn_data = []
+        logging.warning(f"Snapshot des données de spawn illisible, il sera régénéré: {e}")
+    return None
 
-def safe_field(val):
+def write_spawn_snapshot(rows, source_stat, source_hash, path=None):
+    """Écrit le snapshot binaire à côté du fichier Excel (écriture atomique)"""
+    snapshot_file = spawn_snapshot_file(path or EXCEL_FILE)
+    snapshot = {
+        "version": SPAWN_SNAPSHOT_VERSION,
+        "source_mtime_ns": source_stat.st_mtime_ns,
+        "source_size": source_stat.st_size,
+        "source_sha256": source_hash,
+        "rows": rows
+    }
     try:
-        if pd.isna(val):
-            return "∅"
-    except Exception:
-        pass
-    if isinstance(val, bool):
-        return str(val).lower()
-    val_str = str(val)
-    if val_str.strip() == "" or val_str.lower() == "nan":
-        return "∅"
-    return val_str
+        tmp_file = f"{snapshot_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, snapshot_file)
+    except Exception as e:
+        # Dossier en lecture seule par exemple : le bot fonctionne quand même, sans accélération
+        logging.warning(f"Impossible d'écrire le snapshot des données de spawn: {e}")
 
-def split_long_field(label, emoji, value, max_length=1700):
-    """Divise un champ trop long en plusieurs parties."""
-    if len(value) <= max_length:
-        return [f"{emoji} **{label}** : {value}"]
+def mapped_snapshot_file(path):
+    """Chemin du snapshot colonnaire projetable associé à un fichier Excel"""
+    return os.path.splitext(path)[0] + ".snapshot.col"
+
+def write_mapped_snapshot(rows, source_stat, source_hash, path):
+    """Écrit le snapshot colonnaire (écriture atomique : les processus qui projettent l'ancien fichier le gardent)"""
+    # Table de chaînes propre au fichier : il ne contient que ses propres valeurs
+    table = StringTable()
+    store = SpawnColumns.from_rows(rows, table)
+    dataset = SpawnDataset(store)
+    columns = store.columns
     
-    items = [item.strip() for item in value.split('|') if item.strip()]
+    cells = array("I")
+    for codes in store.codes:
+        cells.extend(codes)
+    sections = {"cells": cells}
+    for prefix, index in (("name", dataset.rows_by_name), ("biome", dataset.rows_by_biome)):
+        offsets = array("I", [0])
+        row_ids = array("I")
+        for row_list in index.values():
+            row_ids.extend(row_list)
+            offsets.append(len(row_ids))
+        sections[f"{prefix}_keys"] = array("I", (table.code(key) for key in index))
+        sections[f"{prefix}_offsets"] = offsets
+        sections[f"{prefix}_rows"] = row_ids
+    # Bitmaps des filtres : un bloc de taille fixe par valeur, bit i = ligne i (petit-boutiste)
+    bitmap_size = (len(rows) + 7) // 8
+    for i, bitmap in enumerate(dataset.bitmaps.values()):
+        sections[f"bitmap_{i}_keys"] = array("I", (table.code(value) for value in bitmap))
+        sections[f"bitmap_{i}_words"] = b"".join(bits.to_bytes(bitmap_size, "little") for bits in bitmap.values())
+    encoded = [value.encode("utf-8") for value in table.values]
+    string_offsets = array("I", [0])
+    for value in encoded:
+        string_offsets.append(string_offsets[-1] + len(value))
+    sections["strings_offsets"] = string_offsets
+    sections["strings_data"] = b"".join(encoded)
     
-    parts = []
-    current_part = []
-    current_length = 0
-    base_prefix = f"{emoji} **{label}** : "
-    cont_prefix = f"{emoji} **{label} (suite)** : "
+    payloads = {name: section.tobytes() if isinstance(section, array) else section for name, section in sections.items()}
+    header = {
+        "version": MAPPED_SNAPSHOT_VERSION,
+        "byteorder": sys.byteorder,
+        "source_mtime_ns": source_stat.st_mtime_ns,
+        "source_size": source_stat.st_size,
+        "source_sha256": source_hash,
+        "rows": len(rows),
+        "columns": columns,
+        "bitmap_columns": list(dataset.bitmaps),
+        "sections": {},
+    }
+    # Les positions des sections dépendent de la taille de l'en-tête : on réserve large puis on complète
+    header_length = len(json.dumps({**header, "sections": {name: [2 ** 40, 2 ** 40] for name in payloads}})) + 64
+    offset = (12 + header_length + 7) & ~7
+    for name, payload in payloads.items():
+        header["sections"][name] = [offset, len(payload)]
+        offset = (offset + len(payload) + 7) & ~7
+    header_bytes = json.dumps(header).encode("utf-8").ljust(header_length)
     
-    for item in items:
-        prefix = base_prefix if not current_part else cont_prefix
-        item_length = len(item) + 3
-        
-        if current_part and (current_length + item_length + len(prefix) > max_length):
-            parts.append(prefix + " | ".join(current_part))
-            current_part = [item]
-            current_length = item_length
+    snapshot_file = mapped_snapshot_file(path)
+    tmp_file = f"{snapshot_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(MAPPED_SNAPSHOT_MAGIC + struct.pack("<I", header_length) + header_bytes)
+            for name, payload in payloads.items():
+                f.seek(header["sections"][name][0])
+                f.write(payload)
+            f.truncate(offset)
+        os.replace(tmp_file, snapshot_file)
+    except BaseException:
+        # Disque plein par exemple : pas de fichier temporaire orphelin à côté des données
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
+
+def open_mapped_snapshot(path):
+    """Projette le snapshot colonnaire d'un fichier Excel, après l'avoir régénéré si le fichier a changé.
+    Retourne (snapshot, signature du fichier)."""
+    snapshot_file = mapped_snapshot_file(path)
+    source_stat = os.stat(path)
+    source_signature = (source_stat.st_mtime_ns, source_stat.st_size)
+    snapshot = None
+    try:
+        snapshot = MappedSpawnSnapshot(snapshot_file)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"Snapshot colonnaire {snapshot_file} illisible, il sera régénéré: {e}")
+    
+    if snapshot and (snapshot.header["source_mtime_ns"], snapshot.header["source_size"]) == source_signature:
+        logging.info(f"Données projetées depuis {snapshot_file}. {snapshot.row_count} entrées disponibles.")
+        return snapshot, source_signature
+    source_hash = file_sha256(path)
+    if snapshot and snapshot.header["source_sha256"] == source_hash:
+        logging.info(f"Données projetées depuis {snapshot_file} (contenu identique). {snapshot.row_count} entrées disponibles.")
+        return snapshot, source_signature
+    
+    rows = read_spawn_rows_from_excel(path)
+    write_mapped_snapshot(rows, source_stat, source_hash, path)
+    snapshot = MappedSpawnSnapshot(snapshot_file)
+    logging.info(f"Données chargées depuis {path}, snapshot colonnaire régénéré. {snapshot.row_count} entrées disponibles.")
+    return snapshot, source_signature
+
+def read_spawn_rows_from_excel(path=None):
+    """Lit le fichier Excel et convertit les lignes en types Python simples (sans dépendance à pandas)"""
+    # Import paresseux : pandas et openpyxl ne sont chargés que si le snapshot doit être régénéré
+    import pandas as pd
+    df = pd.read_excel(path or EXCEL_FILE)
+    rows = df.to_dict(orient="records")
+    for row in rows:
+        for key, val in row.items():
+            if val is not None and not isinstance(val, (str, bool, int, float)):
+                row[key] = str(val)
+    return rows
+
+def read_spawn_rows(path=None):
+    """Lit les lignes de spawn depuis le snapshot binaire s'il correspond au fichier Excel,
+    sinon relit le fichier Excel et régénère le snapshot. Retourne (lignes, signature du fichier)."""
+    path = path or EXCEL_FILE
+    snapshot_file = spawn_snapshot_file(path)
+    source_stat = os.stat(path)
+    source_signature = (source_stat.st_mtime_ns, source_stat.st_size)
+    snapshot = read_spawn_snapshot(path)
+    
+    # Cas rapide : même date de modification et même taille
+    if snapshot and snapshot["source_mtime_ns"] == source_stat.st_mtime_ns and snapshot["source_size"] == source_stat.st_size:
+        logging.info(f"Données chargées depuis le snapshot {snapshot_file}. {len(snapshot['rows'])} entrées disponibles.")
+        return snapshot["rows"], source_signature
+    
+    # Date différente (copie, restauration...) : comparer le contenu avant de relire l'Excel
+    source_hash = file_sha256(path)
+    if snapshot and snapshot["source_sha256"] == source_hash:
+        write_spawn_snapshot(snapshot["rows"], source_stat, source_hash, path)
+        logging.info(f"Données chargées depuis le snapshot {snapshot_file} (contenu identique). {len(snapshot['rows'])} entrées disponibles.")
+        return snapshot["rows"], source_signature
+    
+    rows = read_spawn_rows_from_excel(path)
+    write_spawn_snapshot(rows, source_stat, source_hash, path)
+    logging.info(f"Données chargées depuis {path}, snapshot régénéré. {len(rows)} entrées disponibles.")
+    return rows, source_signature
+
+def build_dataset(path):
+    """Lit un fichier de données, partage ses lignes avec les autres jeux et construit ses index"""
+    if SPAWN_DATA_MMAP:
+        # Données et index lus directement dans le fichier projeté, partagé avec les autres processus
+        try:
+            mapped, source_signature = open_mapped_snapshot(path)
+            return SpawnDataset(mapped, source_signature, path)
+        except OSError as e:
+            # Dossier en lecture seule par exemple : chargement classique en mémoire
+            logging.warning(f"Snapshot colonnaire indisponible pour {path}, chargement en mémoire: {e}")
+    rows, source_signature = read_spawn_rows(path)
+    return SpawnDataset(SpawnColumns.from_rows(rows, SHARED_STRINGS), source_signature, path)
+
+def load_dataset(path):
+    """Charge un jeu de données s'il ne l'est pas déjà (un seul chargement à la fois par fichier)"""
+    dataset = DATASETS.get(path)
+    if dataset is not None:
+        return dataset
+    with _dataset_load_locks_guard:
+        lock = _dataset_load_locks.setdefault(path, threading.Lock())
+    with lock:
+        dataset = DATASETS.get(path)
+        if dataset is not None:
+            return dataset
+        try:
+            dataset = build_dataset(path)
+        except Exception as e:
+            logging.error(f"Erreur lors du chargement du fichier Excel {path}: {e}")
+            dataset = SpawnDataset(SpawnColumns([], [], SHARED_STRINGS, 0), None, path)
+        DATASETS[path] = dataset
+    
+    if path != EXCEL_FILE:
+        logging.info(f"📦 Jeu de données {path} chargé à la demande : {len(dataset.rows)} entrées, "
+                     f"{SHARED_STRINGS.stats()['strings']} valeurs distinctes en mémoire pour {len(DATASETS)} jeu(x)")
+        # Les Pokémon propres à ce modpack sont traduits en arrière-plan
+        snapshot = TRANSLATIONS
+        for pokemon_name in dataset.names:
+            if pokemon_name not in snapshot.translations and pokemon_name not in snapshot.undefined:
+                queue_translation(pokemon_name)
+    return dataset
+
+def load_spawn_data_from_excel():
+    """Charge le jeu de données par défaut (EXCEL_FILE) et construit ses index"""
+    return load_dataset(EXCEL_FILE)
+
+def dataset_file(guild_id):
+    """Fichier de données servi à un serveur"""
+    return GUILD_DATASETS.get(guild_id, EXCEL_FILE)
+
+async def dataset_for(interaction, autocomplete=False):
+    """Jeu de données du serveur de l'interaction, chargé hors de la boucle Discord au premier appel.
+    Le chargement (lecture du fichier Excel) peut dépasser les 3 s laissées par Discord : une commande est
+    d'abord différée ; une autocomplétion, qui ne peut pas l'être, reçoit None pendant le chargement."""
+    path = dataset_file(interaction.guild_id)
+    dataset = DATASETS.get(path)
+    if dataset is None:
+        # Un seul chargement en cours par fichier, partagé par toutes les interactions qui l'attendent :
+        # chaque frappe ne bloque pas un thread de l'exécuteur par défaut sur le verrou du fichier
+        future = _dataset_load_futures.get(path)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(None, load_dataset, path)
+            _dataset_load_futures[path] = future
+            future.add_done_callback(lambda _: _dataset_load_futures.pop(path, None))
+        if autocomplete:
+            return None
+        if not interaction.response.is_done():
+            await interaction.response.defer(ephemeral=True, thinking=True)
+        # shield : une interaction annulée n'annule pas le chargement attendu par les autres
+        dataset = await asyncio.shield(future)
+    return dataset
+
+# Chargements en cours lancés depuis la boucle Discord : fichier -> future (utilisé uniquement dans la boucle)
+_dataset_load_futures = {}
+
+def reload_spawn_data(path=None):
+    """Recharge les données hors de la boucle d'événements puis remplace le jeu courant d'un bloc.
+    L'ancien jeu reste servi tant que le nouveau n'est pas entièrement prêt."""
+    path = path or EXCEL_FILE
+    old_dataset = DATASETS[path]
+    start = time.perf_counter()
+    new_dataset = build_dataset(path)
+    
+    # Échange atomique : les commandes en cours gardent leur référence à l'ancien jeu
+    DATASETS[path] = new_dataset
+    old_names = set(old_dataset.rows_by_name)
+    old_count = len(old_dataset.names)
+    del old_dataset
+    # Les valeurs que seul l'ancien jeu utilisait sont libérées (au prochain rechargement s'il est encore utilisé)
+    released = SHARED_STRINGS.compact()
+    
+    new_names = set(new_dataset.rows_by_name)
+    added = sorted(new_names - old_names)
+    removed = sorted(old_names - new_names)
+    logging.info(f"🔄 Données {path} rechargées en {time.perf_counter() - start:.2f} s : "
+                 f"{old_count} → {len(new_dataset.names)} Pokémon, {len(new_dataset.rows)} entrées, "
+                 f"{len(added)} Pokémon ajouté(s), {len(removed)} retiré(s), {released} chaîne(s) libérée(s)")
+    if added:
+        logging.info(f"Pokémon ajoutés : {', '.join(added[:20])}{' ...' if len(added) > 20 else ''}")
+    if removed:
+        logging.info(f"Pokémon retirés : {', '.join(removed[:20])}{' ...' if len(removed) > 20 else ''}")
+    
+    # Les nouveaux Pokémon sont traduits en arrière-plan
+    for pokemon_name in added:
+        queue_translation(pokemon_name)
+
+def spawn_data_watcher():
+    """Surveille les fichiers Excel chargés et recharge un jeu de données dès que son fichier change"""
+    failed_signatures = {}
+    while True:
+        time.sleep(SPAWN_RELOAD_INTERVAL)
+        for path, dataset in list(DATASETS.items()):
+            try:
+                source_stat = os.stat(path)
+            except OSError:
+                continue
+            signature = (source_stat.st_mtime_ns, source_stat.st_size)
+            if signature == dataset.source_signature or signature == failed_signatures.get(path):
+                continue
+            
+            # Attendre que la copie du fichier soit terminée (taille et date stables)
+            time.sleep(1.0)
+            try:
+                source_stat = os.stat(path)
+            except OSError:
+                continue
+            if (source_stat.st_mtime_ns, source_stat.st_size) != signature:
+                continue
+            
+            try:
+                reload_spawn_data(path)
+            except Exception as e:
+                # Fichier en cours d'écriture ou invalide : on garde l'ancien jeu et on attend une nouvelle modification
+                failed_signatures[path] = signature
+                logging.error(f"Erreur lors du rechargement à chaud de {path}, anciennes données conservées: {e}")
+
+def start_spawn_data_watcher():
+    """Démarre la surveillance du fichier Excel (si activée)"""
+    if SPAWN_RELOAD_INTERVAL <= 0:
+        return
+    threading.Thread(target=spawn_data_watcher, name="spawn-data-watcher", daemon=True).start()
+    logging.info(f"Rechargement à chaud activé : vérification des fichiers de données toutes les {SPAWN_RELOAD_INTERVAL:g} s")
+
+def safe_field(val):
+    """Valeur texte d'une cellule lue dans le fichier Excel, appliquée une fois au chargement (SpawnColumns)"""
+    # Cellules vides : None ou NaN (NaN est le seul float différent de lui-même)
+    if val is None or (isinstance(val, float) and val != val):
+        return "∅"
+    if isinstance(val, bool):
+        return str(val).lower()
+    val_str = str(val)
+    if val_str.strip() == "" or val_str.lower() == "nan":
+        return "∅"
+    return val_str
+
+def split_list_field(val):
+    """Découpe un champ multi-valeurs (séparateur |) en liste de valeurs non vides"""
+    value = safe_field(val)
+    if value == "∅":
+        return []
+    return [item.strip() for item in value.split('|') if item.strip()]
+
+def filter_values(column, val):
+    """Valeurs normalisées d'une cellule pour les bitmaps de filtres (∅ si la cellule est vide)"""
+    if column in FLAG_COLUMNS:
+        value = safe_field(val).lower()
+        if value in ("1", "1.0"):
+            value = "true"
+        elif value in ("0", "0.0"):
+            value = "false"
+        return [value]
+    return split_list_field(val) or ["∅"]
+
+def split_long_field(label, emoji, value, max_length=1700, continued="suite"):
+    """Divise un champ trop long en plusieurs parties."""
+    if len(value) <= max_length:
+        return [f"{emoji} **{label}** : {value}"]
+    
+    items = [item.strip() for item in value.split('|') if item.strip()]
+    
+    parts = []
+    current_part = []
+    current_length = 0
+    base_prefix = f"{emoji} **{label}** : "
+    cont_prefix = f"{emoji} **{label} ({continued})** : "
+    
+    for item in items:
+        prefix = base_prefix if not current_part else cont_prefix
+        item_length = len(item) + 3
+        
+        if current_part and (current_length + item_length + len(prefix) > max_length):
+            parts.append(prefix + " | ".join(current_part))
+            current_part = [item]
+            current_length = item_length
         else:
             current_part.append(item)
             current_length += item_length
@@ -484,13 +1825,15 @@ def split_long_field(label, emoji, value, max_length=1700):
     return parts
 
 def prepare_message_parts(fields_output, header, max_length=1900):
-    """Prépare les parties du message à envoyer."""
+    """Prépare les parties du message à envoyer.
+    Aucune partie vide, et aucune plus longue que la description d'un embed (un champ indivisible est coupé)."""
     message_parts = []
     current_part = header
     
     for field in fields_output:
         if len(current_part + "\n" + field) > max_length:
-            message_parts.append(current_part)
+            if current_part:
+                message_parts.append(current_part)
             current_part = field
         else:
             if current_part == header:
@@ -501,12 +1844,373 @@ def prepare_message_parts(fields_output, header, max_length=1900):
     if current_part:
         message_parts.append(current_part)
     
-    return message_parts
+    return [chunk for part in message_parts for chunk in wrap_long_part(part)]
+
+def wrap_long_part(part, limit=EMBED_DESCRIPTION_LIMIT):
+    """Coupe une partie trop longue pour un embed, de préférence à un saut de ligne ou à une espace"""
+    chunks = []
+    while len(part) > limit:
+        cut = max(part.rfind("\n", 0, limit), part.rfind(" ", 0, limit))
+        if cut <= 0:
+            cut = limit
+        chunks.append(part[:cut])
+        part = part[cut:].lstrip("\n ")
+    if part:
+        chunks.append(part)
+    return chunks
+
+@contextmanager
+def startup_timer(step):
+    """Mesure la durée d'une étape du démarrage (ajoutée au rapport de démarrage à froid)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_TIMINGS[step] = time.perf_counter() - start
+
+def log_startup_report():
+    """Journalise une seule fois le temps de démarrage à froid, étape par étape"""
+    if "ready" in STARTUP_TIMINGS:
+        return
+    STARTUP_TIMINGS["ready"] = time.perf_counter() - _STARTUP_T0
+    labels = [("imports", "imports"), ("translations", "cache de traductions"),
+              ("data", "données de spawn"), ("sync", "synchronisation des commandes")]
+    details = ", ".join(f"{label} {STARTUP_TIMINGS[step] * 1000:.0f} ms" for step, label in labels if step in STARTUP_TIMINGS)
+    logging.info(f"⏱️ Démarrage à froid : {details}, prêt en {STARTUP_TIMINGS['ready']:.2f} s")
+
+# Bornes (secondes) des histogrammes de latence
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Avancement du préchargement des traductions
+PRELOAD_PROGRESS = {"total": 0, "processed": 0, "running": False}
 
+class Metrics:
+    """Compteurs et histogrammes en mémoire, partagés entre la boucle Discord et les threads"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}    # (nom, labels triés) -> valeur
+        self.histograms = {}  # (nom, labels triés) -> [compte par borne, somme, total]
+    
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+    
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [[0] * len(LATENCY_BUCKETS), 0.0, 0]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += value
+            histogram[2] += 1
+    
+    def snapshot(self):
+        """État courant des métriques et des jauges (données, préchargement, caches), en types JSON"""
+        with self.lock:
+            counters = [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in self.counters.items()]
+            histograms = [{"name": name, "labels": dict(labels), "buckets": dict(zip(LATENCY_BUCKETS, histogram[0])),
+                           "sum": histogram[1], "count": histogram[2]}
+                          for (name, labels), histogram in self.histograms.items()]
+        
+        lookups = {}
+        for counter in counters:
+            if counter["name"] == "translation_cache_lookups_total":
+                lookups[counter["labels"]["result"]] = lookups.get(counter["labels"]["result"], 0) + counter["value"]
+        total_lookups = lookups.get("hit", 0) + lookups.get("miss", 0)
+        
+        datasets = list(DATASETS.values())
+        try:
+            data_file_age = time.time() - os.stat(EXCEL_FILE).st_mtime
+        except OSError:
+            data_file_age = None
+        
+        return {
+            "counters": counters,
+            "histograms": histograms,
+            "slow_requests": list(RECENT_SLOW_REQUESTS),
+            "recent_dispatches": list(RECENT_DISPATCHES),
+            "profiler_running": PROFILER.running,
+            "gauges": {
+                "guilds": len(bot.guilds),
+                "shards": bot.shard_count or 1,
+                "rows_loaded": sum(len(dataset.rows) for dataset in datasets),
+                "datasets_loaded": len(datasets),
+                "stored_cells": sum(len(dataset.store.columns) * dataset.store.row_count for dataset in datasets),
+                "shared_strings": SHARED_STRINGS.stats()["strings"],
+                "data_file_age_seconds": data_file_age,
+                "translation_cache_hit_ratio": lookups.get("hit", 0) / total_lookups if total_lookups else 0.0,
+                "translations_cached": len(TRANSLATIONS.translations),
+                "translations_undefined": len(TRANSLATIONS.undefined),
+                "translation_failures_pending": len(TRANSLATIONS.failures),
+                "translation_queue_size": _translation_queue.qsize(),
+                "preload_total": PRELOAD_PROGRESS["total"],
+                "preload_processed": PRELOAD_PROGRESS["processed"],
+                "preload_running": int(PRELOAD_PROGRESS["running"]),
+                "render_cache_hit_ratio": RENDER_CACHE.stats()["hit_ratio"],
+                "uptime_seconds": time.perf_counter() - _STARTUP_T0,
+            },
+        }
+    
+    def render_prometheus(self):
+        """Exposition au format texte de Prometheus (préfixe wherepokemon_)"""
+        def format_labels(labels):
+            if not labels:
+                return ""
+            return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+        
+        stats = self.snapshot()
+        lines = []
+        declared = set()
+        for counter in sorted(stats["counters"], key=lambda c: (c["name"], sorted(c["labels"].items()))):
+            name = f"wherepokemon_{counter['name']}"
+            if name not in declared:
+                lines.append(f"# TYPE {name} counter")
+                declared.add(name)
+            lines.append(f"{name}{format_labels(counter['labels'])} {counter['value']}")
+        for histogram in sorted(stats["histograms"], key=lambda h: (h["name"], sorted(h["labels"].items()))):
+            name = f"wherepokemon_{histogram['name']}"
+            if name not in declared:
+                lines.append(f"# TYPE {name} histogram")
+                declared.add(name)
+            for bound, count in histogram["buckets"].items():
+                lines.append(f"{name}_bucket{format_labels({**histogram['labels'], 'le': bound})} {count}")
+            lines.append(f"{name}_bucket{format_labels({**histogram['labels'], 'le': '+Inf'})} {histogram['count']}")
+            lines.append(f"{name}_sum{format_labels(histogram['labels'])} {histogram['sum']}")
+            lines.append(f"{name}_count{format_labels(histogram['labels'])} {histogram['count']}")
+        for gauge, value in stats["gauges"].items():
+            if value is None:
+                continue
+            lines.append(f"# TYPE wherepokemon_{gauge} gauge")
+            lines.append(f"wherepokemon_{gauge} {value}")
+        return "\n".join(lines) + "\n"
+
+METRICS = Metrics()
+
+# Dernières interactions lentes, exposées aussi dans /stats
+RECENT_SLOW_REQUESTS = deque(maxlen=50)
+
+class InteractionTrace:
+    """Chronométrage d'une interaction, étape par étape (correspondance, traduction, rendu, envoi...)"""
+    
+    def __init__(self, command, lang, query):
+        self.command = command
+        self.lang = lang
+        self.query = query
+        self.results = None
+        self.start = time.perf_counter()
+        self.phases = {}  # étape -> durée cumulée en secondes
+        self.phase = None
+        self.phase_start = self.start
+    
+    def enter(self, phase):
+        """Termine l'étape en cours et démarre la suivante"""
+        now = time.perf_counter()
+        if self.phase is not None:
+            self.phases[self.phase] = self.phases.get(self.phase, 0.0) + now - self.phase_start
+        self.phase = phase
+        self.phase_start = now
+    
+    def finish(self, error=None):
+        """Clôt la trace : histogramme de latence, et entrée structurée si le seuil est dépassé"""
+        self.enter(None)
+        # L'attente volontaire de l'autocomplétion n'est pas du temps de traitement : mesurée à part
+        debounce = self.phases.get("debounce", 0.0)
+        elapsed = time.perf_counter() - self.start - debounce
+        METRICS.observe("command_latency_seconds", elapsed, command=self.command, lang=self.lang)
+        if debounce:
+            METRICS.observe("autocomplete_debounce_seconds", debounce, command=self.command, lang=self.lang)
+        if elapsed * 1000 < SLOW_REQUEST_THRESHOLD_MS:
+            return
+        
+        entry = {
+            "command": self.command,
+            "lang": self.lang,
+            "query": self.query,
+            "results": self.results,
+            "total_ms": round(elapsed * 1000, 1),  # hors attente de l'autocomplétion (voir phases_ms)
+            "phases_ms": {phase: round(duration * 1000, 1) for phase, duration in self.phases.items()},
+        }
+        if error is not None:
+            entry["error"] = repr(error)
+        RECENT_SLOW_REQUESTS.append(entry)
+        METRICS.inc("slow_requests_total", command=self.command, lang=self.lang)
+        logging.warning(f"🐢 Interaction lente : {json.dumps(entry, ensure_ascii=False)}")
+
+# Trace de l'interaction en cours (propre à chaque tâche asyncio)
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+
+@contextmanager
+def trace_interaction(command, lang, query):
+    """Trace une interaction complète ; les fonctions appelées marquent leurs étapes avec trace_phase"""
+    trace = InteractionTrace(command, lang, query)
+    token = _current_trace.set(trace)
+    error = None
+    try:
+        yield trace
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        _current_trace.reset(token)
+        trace.finish(error)
+
+def trace_phase(phase):
+    """Passe l'interaction en cours à l'étape suivante (sans effet hors d'une interaction tracée)"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.enter(phase)
+
+def trace_results(count):
+    """Note le nombre de résultats de l'interaction en cours"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.results = count
+
+class SamplingProfiler:
+    """Profileur par échantillonnage de la boucle Discord : relève sa pile à intervalle fixe depuis un thread,
+    sans instrumenter le code. Les piles sont agrégées au format « collapsed » (flamegraph.pl, speedscope)."""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}  # pile "fichier:fonction;..." -> nombre d'échantillons
+        self.running = False
+        self.thread = None
+        self.target_ident = None
+    
+    def start(self, interval_ms=None):
+        """Démarre l'échantillonnage. Lève ValueError si l'intervalle n'est pas un nombre de millisecondes positif."""
+        interval_ms = PROFILER_INTERVAL_MS if interval_ms is None else interval_ms
+        # « not 0 < x < inf » rejette aussi NaN
+        if not 0 < interval_ms < float("inf"):
+            raise ValueError(f"intervalle d'échantillonnage invalide : {interval_ms} ms")
+        with self.lock:
+            if self.running:
+                return False
+            self.running = True
+            self.samples = {}
+        # La boucle Discord tourne dans le thread principal (bot.run)
+        self.target_ident = threading.main_thread().ident
+        interval = interval_ms / 1000
+        self.thread = threading.Thread(target=self._sample, args=(interval,), name="sampling-profiler", daemon=True)
+        self.thread.start()
+        logging.info(f"🔬 Profileur par échantillonnage démarré (toutes les {interval * 1000:.0f} ms)")
+        return True
+    
+    def stop(self):
+        with self.lock:
+            if not self.running:
+                return False
+            self.running = False
+        self.thread.join()
+        top = sorted(self.samples.items(), key=lambda item: item[1], reverse=True)[:5]
+        details = " ; ".join(f"{count} × {stack.rsplit(';', 1)[-1]}" for stack, count in top)
+        logging.info(f"🔬 Profileur arrêté, {sum(self.samples.values())} échantillons. Plus fréquents : {details}")
+        return True
+    
+    def toggle(self):
+        return self.stop() if self.running else self.start()
+    
+    def _sample(self, interval):
+        try:
+            while self.running:
+                frame = sys._current_frames().get(self.target_ident)
+                stack = []
+                while frame is not None:
+                    stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+                    frame = frame.f_back
+                if stack:
+                    key = ";".join(reversed(stack))
+                    with self.lock:
+                        self.samples[key] = self.samples.get(key, 0) + 1
+                time.sleep(interval)
+        except Exception as e:
+            # Le profileur ne doit pas rester affiché comme actif si son thread s'est arrêté
+            logging.error(f"Erreur du profileur par échantillonnage, arrêté: {e}")
+            with self.lock:
+                self.running = False
+    
+    def collapsed(self):
+        """Piles échantillonnées, une par ligne suivie de son nombre d'échantillons"""
+        with self.lock:
+            samples = sorted(self.samples.items(), key=lambda item: item[1], reverse=True)
+        return "".join(f"{stack} {count}\n" for stack, count in samples)
+
+PROFILER = SamplingProfiler()
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Sert /metrics (Prometheus), /stats (JSON) et /profiler (piles échantillonnées)"""
+    
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body = METRICS.render_prometheus().encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/stats":
+            body = json.dumps(METRICS.snapshot(), ensure_ascii=False, indent=2).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        elif path == "/profiler":
+            body = PROFILER.collapsed().encode("utf-8")
+            content_type = "text/plain; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        self.send_body(body, content_type)
+    
+    def do_POST(self):
+        # Activation du profileur à chaud : POST /profiler/start[?interval_ms=5] et POST /profiler/stop
+        path, _, query = self.path.partition("?")
+        if path == "/profiler/start":
+            params = dict(param.split("=", 1) for param in query.split("&") if "=" in param)
+            try:
+                PROFILER.start(float(params["interval_ms"]) if "interval_ms" in params else None)
+            except ValueError:
+                self.send_error(400, "interval_ms doit être un nombre de millisecondes positif")
+                return
+        elif path == "/profiler/stop":
+            PROFILER.stop()
+        else:
+            self.send_error(404)
+            return
+        self.send_body(json.dumps({"profiler_running": PROFILER.running}).encode("utf-8"), "application/json; charset=utf-8")
+    
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        # Les accès au point de terminaison ne polluent pas les journaux du bot
+        pass
+
+def start_metrics_server():
+    """Démarre le serveur HTTP des métriques dans un thread dédié"""
+    server = ThreadingHTTPServer((METRICS_HOST, METRICS_PORT), MetricsRequestHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logging.info(f"📈 Métriques disponibles sur http://{METRICS_HOST}:{server.server_address[1]}/metrics (JSON : /stats)")
+    return server
+
+# Les commandes slash n'ont pas besoin du contenu des messages (intent privilégié, soumis à vérification au-delà de 100 serveurs)
 intents = discord.Intents.default()
-intents.message_content = True
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+# Une seule instance sert tous les serveurs : données et traductions sont chargées une fois et partagées
+if AUTO_SHARD:
+    bot = commands.AutoShardedBot(command_prefix="!", intents=intents, shard_count=SHARD_COUNT)
+else:
+    bot = commands.Bot(command_prefix="!", intents=intents)
+
+def add_app_command(command):
+    """Ajoute une commande à l'arbre : globale, ou sur chacun des serveurs configurés"""
+    if GLOBAL_COMMANDS:
+        bot.tree.add_command(command)
+    else:
+        bot.tree.add_command(command, guilds=[discord.Object(id=guild_id) for guild_id in GUILD_IDS])
 
 def extract_regional_form(name, lang="fr"):
     """Extrait la forme régionale d'un nom de Pokémon dans une langue spécifique"""
@@ -515,6 +2219,268 @@ def extract_regional_form(name, lang="fr"):
             return form_en
     return None
 
+class RenderCache:
+    """Cache LRU borné des réponses déjà mises en forme, par (jeu de données, entrées, langue, show_all).
+    Il est vidé dès que la version des traductions change ; les réponses d'un jeu rechargé sortent par l'ordre LRU."""
+    
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.generation = None
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key, generation):
+        if generation != self.generation:
+            # Traductions publiées : tout ce qui est en cache est périmé
+            self.entries.clear()
+            self.generation = generation
+        rendered = self.entries.get(key)
+        if rendered is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return rendered
+    
+    def put(self, key, rendered):
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = rendered
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0
+        }
+
+RENDER_CACHE = RenderCache(RENDER_CACHE_SIZE)
+
+def render_entry(entry, entry_index, total, lang, show_all=False):
+    """Met en forme une entrée de spawn en parties de message prêtes à envoyer"""
+    pack = LANGUAGE_PACKS[lang]
+    
+    # Obtenir le nom du Pokémon avec ses features
+    pokemon_name = entry.get('Pokemon')
+    
+    # Extraire les features pour l'affichage
+    features = ""
+    feature_match = re.search(r'\s+[^a-zA-Z0-9\s]', pokemon_name)
+    if feature_match:
+        features = pokemon_name[feature_match.start():].strip()
+    
+    # Obtenir le nom traduit avec toutes les parties (cache uniquement)
+    translated_name = get_cached_pokemon_name(pokemon_name, lang)
+    
+    # En-tête localisé (avec le nom du fichier quand il n'y a pas de features), utilisé comme titre d'embed
+    header_template = pack.header if features else pack.header_with_original
+    header = header_template.format(name=translated_name, original=pokemon_name, index=entry_index + 1, total=total)
+    header = header[:EMBED_TITLE_LIMIT]
+    
+    fields_output = []
+    attachments = []
+    
+    # Champs précompilés pour la langue : (emoji, label, colonne, peut être découpé)
+    for emoji, label, field_name, splittable in pack.fields:
+        value = entry.get(field_name)
+        if show_all or (value != "∅" and value):
+            # Traitement spécial pour les champs qui peuvent être longs (biomes)
+            if splittable and len(value) > LONG_FIELD_ATTACHMENT_LIMIT:
+                # Très longue liste : un fichier texte joint plutôt que de nombreux messages
+                items = [item.strip() for item in value.split('|') if item.strip()]
+                filename = f"{re.sub(r'[^a-z0-9]+', '_', field_name.lower()).strip('_')}_{entry_index + 1}.txt"
+                attachments.append((filename, f"{label}\n" + "\n".join(items) + "\n"))
+                fields_output.append(f"{emoji} **{label}** : " + pack.attachment.format(count=len(items), filename=filename))
+            elif splittable:
+                fields_output.extend(split_long_field(label, emoji, value, continued=pack.continued))
+            else:
+                fields_output.append(f"{emoji} **{label}** : {value}")
+    
+    # Si aucun champ n'a de valeur, ajouter un message par défaut
+    if not fields_output:
+        fields_output.append(pack.no_info)
+    
+    # Préparer les parties du message : (titre de l'embed, descriptions, fichiers joints)
+    return (header, prepare_message_parts(fields_output, ""), attachments)
+
+def render_search_results(dataset, row_ids, lang, show_all=False):
+    """Met en forme tous les résultats d'une recherche, en passant par le cache LRU des réponses"""
+    key = (dataset.generation, tuple(row_ids), lang, show_all)
+    rendered = RENDER_CACHE.get(key, TRANSLATIONS.version)
+    if rendered is None:
+        rendered = [render_entry(dataset.rows[row_id], entry_index, len(row_ids), lang, show_all)
+                    for entry_index, row_id in enumerate(row_ids)]
+        RENDER_CACHE.put(key, rendered)
+    return rendered
+
+# Historique borné des envois par interaction (nombre de messages, latences), exposé dans /stats
+RECENT_DISPATCHES = deque(maxlen=200)
+
+class ResponseDispatcher:
+    """Envoie les réponses d'une interaction en respectant les limites de Discord.
+    Les réponses 429 sont réessayées après le délai Retry-After et chaque envoi est mesuré."""
+    
+    def __init__(self, interaction, command):
+        self.interaction = interaction
+        self.command = command
+        self.sends = 0
+        self.retries = 0
+        self.latencies = []
+        self.deferred_replaced = False
+    
+    async def call(self, func, *args, **kwargs):
+        """Appelle l'API Discord, en réessayant si la limite de débit est atteinte"""
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            start = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except discord.HTTPException as e:
+                if e.status != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                    raise
+                retry_after = rate_limit_delay(e)
+                self.retries += 1
+                METRICS.inc("discord_rate_limit_retries_total", command=self.command)
+                logging.warning(f"Limite de débit Discord atteinte ({self.command}), nouvel essai dans {retry_after:.2f} s")
+                await asyncio.sleep(retry_after)
+                continue
+            self.sends += 1
+            self.latencies.append(time.perf_counter() - start)
+            METRICS.inc("discord_sends_total", command=self.command)
+            return result
+    
+    async def send(self, **kwargs):
+        """Première réponse à l'interaction, ou message de suivi si elle a déjà été donnée"""
+        response_type = getattr(self.interaction.response, "type", None)
+        if response_type == discord.InteractionResponseType.deferred_channel_message and not self.deferred_replaced:
+            # Réponse différée pendant un chargement : le message « réfléchit... » est remplacé
+            self.deferred_replaced = True
+            if "files" in kwargs:
+                kwargs["attachments"] = kwargs.pop("files")
+            return await self.edit_original(**kwargs)
+        if self.interaction.response.is_done():
+            return await self.call(self.interaction.followup.send, ephemeral=True, **kwargs)
+        return await self.call(self.interaction.response.send_message, ephemeral=True, **kwargs)
+    
+    async def edit_original(self, **kwargs):
+        return await self.call(self.interaction.edit_original_response, **kwargs)
+    
+    async def edit_message(self, **kwargs):
+        """Modifie le message portant le composant (clic sur un bouton)"""
+        return await self.call(self.interaction.response.edit_message, **kwargs)
+    
+    def finish(self):
+        """Enregistre le nombre d'envois et leur latence pour cette interaction"""
+        record = {
+            "command": self.command,
+            "sends": self.sends,
+            "retries": self.retries,
+            "latency_ms": round(sum(self.latencies) * 1000, 1)
+        }
+        RECENT_DISPATCHES.append(record)
+        logging.debug(f"Interaction {self.command}: {self.sends} envoi(s), {self.retries} nouvel(s) essai(s), {record['latency_ms']} ms d'API")
+        return record
+
+def rate_limit_delay(error):
+    """Délai demandé par Discord après une réponse 429 (en-tête Retry-After)"""
+    try:
+        return max(float(error.response.headers.get("Retry-After", 1.0)), 0.0)
+    except (AttributeError, TypeError, ValueError):
+        return 1.0
+
+def pack_embed_pages(rendered, footer_length=32):
+    """Regroupe les parties mises en forme en pages d'au plus 10 embeds, 6000 caractères et 10 fichiers joints.
+    Une page est une liste de références (indice de l'entrée, indice de la partie)."""
+    pages = []
+    current = []
+    current_length = footer_length
+    current_files = 0
+    for entry_index, (title, parts, attachments) in enumerate(rendered):
+        for part_index, description in enumerate(parts):
+            # Titre éventuellement complété par l'indicateur de partie
+            size = min(len(title) + 24, EMBED_TITLE_LIMIT) + len(description)
+            # Les fichiers d'une entrée sont joints à la page de sa première partie
+            files = len(attachments) if part_index == 0 else 0
+            if current and (len(current) >= MAX_EMBEDS_PER_MESSAGE or current_length + size > MESSAGE_EMBED_CHAR_BUDGET
+                            or current_files + files > MAX_FILES_PER_MESSAGE):
+                pages.append(current)
+                current = []
+                current_length = footer_length
+                current_files = 0
+            current.append((entry_index, part_index))
+            current_length += size
+            current_files += files
+    if current:
+        pages.append(current)
+    return pages
+
+class ResultPaginator(discord.ui.View):
+    """Affiche les résultats d'une recherche dans un seul message, page par page (boutons Précédent/Suivant).
+    Chaque page regroupe autant d'embeds que les limites de Discord le permettent ;
+    les embeds et fichiers joints sont construits à la demande à partir des parties déjà mises en forme."""
+    
+    def __init__(self, rendered, lang, timeout=PAGINATION_TIMEOUT):
+        super().__init__(timeout=timeout)
+        self.rendered = rendered
+        self.pack = LANGUAGE_PACKS[lang]
+        self.pages = pack_embed_pages(rendered)
+        self.page_count = len(self.pages)
+        self.page = 0
+        self.interaction = None
+        self.update_buttons()
+    
+    def build_embeds(self):
+        embeds = []
+        for entry_index, part_index in self.pages[self.page]:
+            title, parts, attachments = self.rendered[entry_index]
+            if len(parts) > 1:
+                title = f"{title} ({self.pack.part} {part_index + 1}/{len(parts)})"[:EMBED_TITLE_LIMIT]
+            embeds.append(discord.Embed(title=title, description=parts[part_index], color=EMBED_COLOR))
+        if self.page_count > 1:
+            embeds[-1].set_footer(text=self.pack.page.format(page=self.page + 1, pages=self.page_count))
+        return embeds
+    
+    def build_files(self):
+        """Fichiers joints des entrées qui commencent sur cette page (recréés à chaque envoi)"""
+        files = []
+        for entry_index, part_index in self.pages[self.page]:
+            if part_index == 0:
+                for filename, content in self.rendered[entry_index][2]:
+                    files.append(discord.File(io.BytesIO(content.encode("utf-8")), filename=filename))
+        return files
+    
+    def update_buttons(self):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= self.page_count - 1
+    
+    async def show_page(self, interaction, page):
+        self.page = max(0, min(page, self.page_count - 1))
+        self.update_buttons()
+        dispatcher = ResponseDispatcher(interaction, "page")
+        await dispatcher.edit_message(embeds=self.build_embeds(), attachments=self.build_files(), view=self)
+        dispatcher.finish()
+    
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show_page(interaction, self.page - 1)
+    
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show_page(interaction, self.page + 1)
+    
+    async def on_timeout(self):
+        # Retirer les boutons devenus inactifs (le jeton de l'interaction reste valable 15 minutes)
+        if self.interaction is not None:
+            try:
+                await self.interaction.edit_original_response(view=None)
+            except discord.HTTPException:
+                pass
+
 async def pokemon_search(interaction: discord.Interaction, pokemon: str, lang: str, show_all: bool = False):
     """Fonction générique de recherche de Pokémon utilisée par toutes les commandes"""
     # Vérifier si c'est une valeur d'autocomplétion (contient un séparateur |)
@@ -526,393 +2492,154 @@ async def pokemon_search(interaction: discord.Interaction, pokemon: str, lang: s
     else:
         search_term = pokemon.lower()
     
-    # Vérifier si la langue existe dans le dictionnaire inverse
-    if lang not in REVERSE_TRANSLATIONS:
-        REVERSE_TRANSLATIONS[lang] = {}
+    # Une seule lecture du snapshot : les index dérivés sont déjà en minuscules
+    snapshot = TRANSLATIONS
     
-    # Créer un dictionnaire inversé en minuscules pour la recherche
-    reverse_translations_lower = {k.lower(): v.lower() for k, v in REVERSE_TRANSLATIONS[lang].items()}
+    # Nom anglais correspondant au terme recherché et forme régionale éventuelle
+    english_name = snapshot.reverse.get(lang, {}).get(search_term)
+    search_regional_form = extract_regional_form(search_term, lang)
     
-    # Rechercher le Pokémon
+    # Une seule lecture du jeu de données : un rechargement à chaud ne change rien en cours de recherche.
+    # Le premier appel d'un serveur peut charger son fichier (et différer la réponse) : étape mesurée à part
+    trace_phase("loading")
+    dataset = await dataset_for(interaction)
+    
+    # Rechercher le Pokémon (indices des lignes correspondantes)
     results = []
-    for entry in spawn_data:
-        pokemon_entry = safe_field(entry.get("Pokemon"))
-        
-        # Si nous avons un nom exact à chercher (de l'autocomplétion)
-        if exact_pokemon_name and pokemon_entry == exact_pokemon_name:
-            results.append(entry)
-            continue
-        
-        # Si aucun résultat exact n'est disponible, continuez avec la recherche normale
-        if not exact_pokemon_name:
-            pokemon_name_lower = pokemon_entry.lower()
-            
-            # Recherche directe - si le terme de recherche fait partie du nom dans Excel
-            if search_term in pokemon_name_lower:
-                results.append(entry)
-                continue
-                
-            # Recherche par nom traduit
-            if pokemon_entry in TRANSLATIONS_CACHE and lang in TRANSLATIONS_CACHE[pokemon_entry]:
-                translated_name = TRANSLATIONS_CACHE[pokemon_entry][lang].lower()
-                if search_term in translated_name:
-                    results.append(entry)
-                    continue
-                    
-            # Recherche basée sur la correspondance du dictionnaire inverse
-            if english_name and english_name in pokemon_name_lower:
-                results.append(entry)
-                continue
-                
-            # Pour les formes régionales
-            if search_regional_form:
-                # Vérifier si la forme régionale correspond
-                matches_regional_form = False
-                
-                # 1. Vérifier si la forme régionale est au début (hisuian arcanine)
-                if pokemon_name_lower.startswith(search_regional_form.lower()):
-                    matches_regional_form = True
-                # 2. Vérifier si la forme régionale est à la fin (arcanine hisuian)
-                elif pokemon_name_lower.endswith(search_regional_form.lower()):
-                    matches_regional_form = True
-                # 3. Vérifier des formes spécifiques
-                elif f" {search_regional_form.lower()}" in pokemon_name_lower:
-                    matches_regional_form = True
-                
-                if matches_regional_form:
-                    # Obtenir le nom traduit du Pokémon avec sa forme
-                    translated_name = get_pokemon_name(pokemon_entry, lang)
-                    if translated_name.lower() in search_term.lower() or search_term.lower() in translated_name.lower():
-                        results.append(entry)
-                        continue
+    trace_phase("matching")
+    if exact_pokemon_name:
+        # Nom exact venant de l'autocomplétion : lecture directe de l'index
+        results = list(dataset.rows_by_name.get(exact_pokemon_name, []))
+    else:
+        # Sinon, comparaison de chaînes sur les clés préparées, une fois par Pokémon distinct et non par ligne
+        term = fold_search_text(search_term)
+        english_key = fold_search_text(english_name) if english_name else None
+        index = dataset.search_index
+        _, translated_keys, displayed_keys = index.translated(lang, snapshot)
+        for position, original in enumerate(index.originals):
+            translated = translated_keys[position]
+            # Nom dans Excel, nom traduit, nom anglais correspondant à une traduction exacte,
+            # ou même forme régionale avec un nom affiché (forme et features comprises) qui correspond
+            if (term in original
+                    or (translated is not None and term in translated)
+                    or (english_key and english_key in original)
+                    or (search_regional_form and index.regional_forms[position] == search_regional_form
+                        and (displayed_keys[position] in term or term in displayed_keys[position]))):
+                results.extend(dataset.rows_by_name[index.names[position]])
+        # Ordre du fichier, comme un parcours ligne par ligne
+        results.sort()
+    trace_results(len(results))
     
+    pack = LANGUAGE_PACKS[lang]
+    dispatcher = ResponseDispatcher(interaction, f"search:{lang}")
     if not results:
         # Message d'erreur localisé selon la langue de recherche
-        error_messages = {
-            "en": f"❌ No information found for **{pokemon}**.",
-            "fr": f"❌ Aucune information trouvée pour **{pokemon}**.",
-            "de": f"❌ Keine Informationen gefunden für **{pokemon}**.",
-            "ja": f"❌ **{pokemon}**の情報が見つかりませんでした。"
-        }
-        await interaction.response.send_message(error_messages.get(lang, error_messages["en"]), ephemeral=True)
+        trace_phase("send")
+        await dispatcher.send(content=pack.not_found.format(pokemon=pokemon))
+        dispatcher.finish()
         return
     
-    # Messages de recherche localisés selon la langue
-    searching_messages = {
-        "en": f"Searching information for **{pokemon}**...",
-        "fr": f"Recherche d'informations sur **{pokemon}**...",
-        "de": f"Suche nach Informationen zu **{pokemon}**...",
-        "ja": f"**{pokemon}**の情報を検索中..."
-    }
+    # Les espèces recherchées passent en tête du préchargement
+    PRELOAD_PLANNER.note_search(dataset.rows[row_id].get("Pokemon") for row_id in results)
     
-    # Répondre d'abord pour éviter le timeout
-    await interaction.response.send_message(searching_messages.get(lang, searching_messages["en"]), ephemeral=True)
+    if TRANSLATION_LOOKUP_TIMEOUT > 0:
+        # Répondre d'abord pour éviter le timeout pendant l'attente des traductions
+        trace_phase("send")
+        await dispatcher.send(content=pack.searching.format(pokemon=pokemon))
+        trace_phase("translation")
+        await resolve_pokemon_names([dataset.rows[row_id].get('Pokemon') for row_id in results], lang)
     
-    for entry_index, entry in enumerate(results):
-        # Obtenir le nom du Pokémon avec ses features
-        pokemon_name = safe_field(entry.get('Pokemon'))
-        
-        # Extraire les features pour l'affichage
-        features = ""
-        feature_match = re.search(r'\s+[^a-zA-Z0-9\s]', pokemon_name)
-        if feature_match:
-            features = pokemon_name[feature_match.start():].strip()
-        
-        # Obtenir le nom traduit avec toutes les parties
-        translated_name = get_pokemon_name(pokemon_name, lang)
-        
-        # Messages d'information localisés
-        info_header = {
-            "en": f"🔍 **Information about {translated_name} (Entry {entry_index+1}/{len(results)})**\n",
-            "fr": f"🔍 **Informations sur {translated_name} (Entrée {entry_index+1}/{len(results)})**\n",
-            "de": f"🔍 **Informationen zu {translated_name} (Eintrag {entry_index+1}/{len(results)})**\n",
-            "ja": f"🔍 **{translated_name}の情報 (エントリー {entry_index+1}/{len(results)})**\n"
-        }
-        
-        if features:
-            header = info_header.get(lang, info_header["en"])
-        else:
-            info_header_with_eng = {
-                "en": f"🔍 **Information about {translated_name} ({pokemon_name}) (Entry {entry_index+1}/{len(results)})**\n",
-                "fr": f"🔍 **Informations sur {translated_name} ({pokemon_name}) (Entrée {entry_index+1}/{len(results)})**\n",
-                "de": f"🔍 **Informationen zu {translated_name} ({pokemon_name}) (Eintrag {entry_index+1}/{len(results)})**\n",
-                "ja": f"🔍 **{translated_name} ({pokemon_name})の情報 (エントリー {entry_index+1}/{len(results)})**\n"
-            }
-            header = info_header_with_eng.get(lang, info_header_with_eng["en"])
-            
-        fields_output = []
-        
-        # Traductions des labels pour chaque langue
-        field_labels = {
-            "Bucket": {
-                "en": "Rarity", "fr": "Rareté", 
-                "de": "Seltenheit", "ja": "レアリティ"
-            },
-            "Dimensions": {
-                "en": "Dimensions", "fr": "Dimensions",
-                "de": "Dimensionen", "ja": "寸法"
-            },
-            "Meilleurs biomes de spawn": {
-                "en": "Best spawn biomes", "fr": "Meilleurs biomes de spawn",
-                "de": "Beste Spawn-Biome", "ja": "最適な出現バイオーム"
-            },
-            "Nombre de concurrents": {
-                "en": "Number of competitors", "fr": "Nombre de concurrents",
-                "de": "Anzahl der Konkurrenten", "ja": "競合数"
-            },
-            "Structures": {
-                "en": "Structures", "fr": "Structures",
-                "de": "Strukturen", "ja": "構造物"
-            },
-            "Moon Phase": {
-                "en": "Moon Phase", "fr": "Phase de Lune",
-                "de": "Mondphase", "ja": "月相"
-            },
-            "Can See Sky": {
-                "en": "Can See Sky", "fr": "Peut voir le ciel",
-                "de": "Kann den Himmel sehen", "ja": "空が見える"
-            },
-            "Min X": {
-                "en": "Min X", "fr": "Min X",
-                "de": "Min X", "ja": "最小 X"
-            },
-            "Min Y": {
-                "en": "Min Y", "fr": "Min Y",
-                "de": "Min Y", "ja": "最小 Y"
-            },
-            "Min Z": {
-                "en": "Min Z", "fr": "Min Z",
-                "de": "Min Z", "ja": "最小 Z"
-            },
-            "Max X": {
-                "en": "Max X", "fr": "Max X",
-                "de": "Max X", "ja": "最大 X"
-            },
-            "Max Y": {
-                "en": "Max Y", "fr": "Max Y",
-                "de": "Max Y", "ja": "最大 Y"
-            },
-            "Max Z": {
-                "en": "Max Z", "fr": "Max Z", 
-                "de": "Max Z", "ja": "最大 Z"
-            },
-            "Min Light": {
-                "en": "Min Light", "fr": "Min Light", 
-                "de": "Min Licht", "ja": "最小光量"
-            },
-            "Max Light": {
-                "en": "Max Light", "fr": "Max Light",
-                "de": "Max Licht", "ja": "最大光量"
-            },
-            "Min Sky Light": {
-                "en": "Min Sky Light", "fr": "Min Sky Light",
-                "de": "Min Himmelslicht", "ja": "最小空光量"
-            },
-            "Max Sky Light": {
-                "en": "Max Sky Light", "fr": "Max Sky Light",
-                "de": "Max Himmelslicht", "ja": "最大空光量"
-            },
-            "Time Range": {
-                "en": "Time Range", "fr": "Plage Horaire",
-                "de": "Zeitbereich", "ja": "時間帯"
-            },
-            "Is Raining": {
-                "en": "Is Raining", "fr": "Il pleut",
-                "de": "Es regnet", "ja": "雨が降っている"
-            },
-            "Is Thundering": {
-                "en": "Is Thundering", "fr": "Il y a de l'orage",
-                "de": "Es gewittert", "ja": "雷が鳴っている"
-            },
-            "Is Slime Chunk": {
-                "en": "Is Slime Chunk", "fr": "Chunk de Slime",
-                "de": "Ist Slime-Chunk", "ja": "スライムチャンク"
-            },
-            "Labels": {
-                "en": "Labels", "fr": "Étiquettes",
-                "de": "Labels", "ja": "ラベル"
-            },
-            "Label Mode": {
-                "en": "Label Mode", "fr": "Mode d'Étiquette",
-                "de": "Label-Modus", "ja": "ラベルモード"
-            },
-            "Min Width": {
-                "en": "Min Width", "fr": "Largeur Min",
-                "de": "Min Breite", "ja": "最小幅"
-            },
-            "Max Width": {
-                "en": "Max Width", "fr": "Largeur Max",
-                "de": "Max Breite", "ja": "最大幅"
-            },
-            "Min Height": {
-                "en": "Min Height", "fr": "Hauteur Min",
-                "de": "Min Höhe", "ja": "最小高"
-            },
-            "Max Height": {
-                "en": "Max Height", "fr": "Hauteur Max",
-                "de": "Max Höhe", "ja": "最大高"
-            },
-            "Needed Nearby Blocks": {
-                "en": "Needed Nearby Blocks", "fr": "Blocs Nécessaires à Proximité",
-                "de": "Benötigte Blöcke in der Nähe", "ja": "必要な近接ブロック"
-            },
-            "Needed Base Blocks": {
-                "en": "Needed Base Blocks", "fr": "Blocs de Base Nécessaires",
-                "de": "Benötigte Basisblöcke", "ja": "必要な基本ブロック"
-            },
-            "Min Depth": {
-                "en": "Min Depth", "fr": "Profondeur Min",
-                "de": "Min Tiefe", "ja": "最小深度"
-            },
-            "Max Depth": {
-                "en": "Max Depth", "fr": "Profondeur Max", 
-                "de": "Max Tiefe", "ja": "最大深度"
-            },
-            "Fluid Is Source": {
-                "en": "Fluid Is Source", "fr": "Fluide Est Source",
-                "de": "Flüssigkeit Ist Quelle", "ja": "流体が湧き水である"
-            },
-            "Fluid Block": {
-                "en": "Fluid Block", "fr": "Bloc de Fluide",
-                "de": "Flüssigkeitsblock", "ja": "流体ブロック"
-            },
-            "Fluid": {
-                "en": "Fluid", "fr": "Fluide",
-                "de": "Flüssigkeit", "ja": "流体"
-            },
-            "Contexte": {
-                "en": "Context", "fr": "Contexte",
-                "de": "Kontext", "ja": "コンテキスト"
-            },
-            "Key Item": {
-                "en": "Key Item", "fr": "Objet Clé",
-                "de": "Schlüsselgegenstand", "ja": "キーアイテム"
-            },
-            "Stone Requirements": {
-                "en": "Stone Requirements", "fr": "Exigences de Pierre", 
-                "de": "Steinanforderungen", "ja": "石の要件"
-            },
-            "Custom Pokemons In Team": {
-                "en": "Custom Pokemons In Team", "fr": "Pokémons Personnalisés Dans l'Équipe",
-                "de": "Benutzerdefinierte Pokémon im Team", "ja": "チーム内のカスタムポケモン"
-            },
-            "Biomes": {
-                "en": "Biomes", "fr": "Biomes",
-                "de": "Biome", "ja": "バイオーム"
-            }
-        }
-        
-        field_mapping = [
-            (field_labels["Bucket"][lang], "📌", "Bucket"),
-            (field_labels["Dimensions"][lang], "🌍", "Dimensions"),
-            (field_labels["Meilleurs biomes de spawn"][lang], "🌟", "Meilleurs biomes de spawn"),
-            (field_labels["Nombre de concurrents"][lang], "🥇", "Nombre de concurrents"),
-            (field_labels["Structures"][lang], "🏰", "Structures"),
-            (field_labels["Moon Phase"][lang], "🌙", "Moon Phase"),
-            (field_labels["Can See Sky"][lang], "☀️", "Can See Sky"),
-            (field_labels["Min X"][lang], "⬅️", "Min X"),
-            (field_labels["Min Y"][lang], "⬇️", "Min Y"),
-            (field_labels["Min Z"][lang], "↙️", "Min Z"),
-            (field_labels["Max X"][lang], "➡️", "Max X"),
-            (field_labels["Max Y"][lang], "⬆️", "Max Y"),
-            (field_labels["Max Z"][lang], "↗️", "Max Z"),
-            (field_labels["Min Light"][lang], "💡", "Min Light"),
-            (field_labels["Max Light"][lang], "💡", "Max Light"),
-            (field_labels["Min Sky Light"][lang], "🌤️", "Min Sky Light"),
-            (field_labels["Max Sky Light"][lang], "🌤️", "Max Sky Light"),
-            (field_labels["Time Range"][lang], "⏰", "Time Range"),
-            (field_labels["Is Raining"][lang], "☔", "Is Raining"),
-            (field_labels["Is Thundering"][lang], "⚡", "Is Thundering"),
-            (field_labels["Is Slime Chunk"][lang], "🟢", "Is Slime Chunk"),
-            (field_labels["Labels"][lang], "🏷️", "Labels"),
-            (field_labels["Label Mode"][lang], "📋", "Label Mode"),
-            (field_labels["Min Width"][lang], "📏", "Min Width"),
-            (field_labels["Max Width"][lang], "📐", "Max Width"),
-            (field_labels["Min Height"][lang], "↕️", "Min Height"),
-            (field_labels["Max Height"][lang], "↕️", "Max Height"),
-            (field_labels["Needed Nearby Blocks"][lang], "🧱", "Needed Nearby Blocks"),
-            (field_labels["Needed Base Blocks"][lang], "🧱", "Needed Base Blocks"),
-            (field_labels["Min Depth"][lang], "⚓", "Min Depth"),
-            (field_labels["Max Depth"][lang], "⚓", "Max Depth"),
-            (field_labels["Fluid Is Source"][lang], "🔄", "Fluid Is Source"),
-            (field_labels["Fluid Block"][lang], "🌊", "Fluid Block"),
-            (field_labels["Fluid"][lang], "💧", "Fluid"),
-            (field_labels["Contexte"][lang], "🧭", "Contexte"),
-            (field_labels["Key Item"][lang], "🔑", "Key Item"),
-            (field_labels["Stone Requirements"][lang], "🪨", "Stone Requirements"),
-            (field_labels["Custom Pokemons In Team"][lang], "👥", "Custom Pokemons In Team"),
-        ]
-        
-        # Traiter tous les champs normaux
-        for label, emoji, field_name in field_mapping:
-            value = safe_field(entry.get(field_name))
-            if show_all or (value != "∅" and value):
-                # Traitement spécial pour les champs qui peuvent être longs
-                if field_name in ["Meilleurs biomes de spawn"] and len(value) > 1700:
-                    biomes_parts = split_long_field(label, emoji, value)
-                    fields_output.extend(biomes_parts)
-                else:
-                    fields_output.append(f"{emoji} **{label}** : {value}")
-        
-        # Traiter le champ des biomes séparément car il peut être très long
-        biomes_value = safe_field(entry.get("Biomes"))
-        if show_all or (biomes_value != "∅" and biomes_value):
-            biomes_parts = split_long_field(field_labels["Biomes"][lang], "🏞️", biomes_value)
-            fields_output.extend(biomes_parts)
-        
-        # Si aucun champ n'a de valeur, ajouter un message par défaut
-        if not fields_output:
-            no_info_msg = {
-                "en": "No specific information is available for this Pokémon.",
-                "fr": "Aucune information spécifique n'est disponible pour ce Pokémon.",
-                "de": "Keine spezifischen Informationen für dieses Pokémon verfügbar.",
-                "ja": "このポケモンに関する特定の情報はありません。"
-            }
-            fields_output.append(no_info_msg.get(lang, no_info_msg["en"]))
-        
-        # Préparer les parties du message
-        all_parts = prepare_message_parts(fields_output, header)
-        
-        # Envoyer chaque partie
-        part_translations = {
-            "en": "Part",
-            "fr": "Partie",
-            "de": "Teil",
-            "ja": "パート"
-        }
-        
-        for i, part in enumerate(all_parts):
-            part_indicator = f" ({part_translations.get(lang, 'Part')} {i+1}/{len(all_parts)})" if len(all_parts) > 1 else ""
-            try:
-                await interaction.followup.send(part + part_indicator, ephemeral=True)
-            except discord.errors.HTTPException as e:
-                logging.error(f"Erreur lors de l'envoi du message (longueur: {len(part)}): {e}")
-                # Si le message est encore trop long, le diviser davantage
-                chunks = textwrap.wrap(part, width=1900, replace_whitespace=False, break_long_words=True)
-                for j, chunk in enumerate(chunks):
-                    sub_indicator = f" ({part_translations.get(lang, 'Part')} {i+1}.{j+1}/{len(all_parts)}.{len(chunks)})"
-                    await interaction.followup.send(chunk + sub_indicator, ephemeral=True)
+    trace_phase("rendering")
+    rendered = render_search_results(dataset, results, lang, show_all)
+    
+    # Un seul message paginé, quel que soit le nombre d'entrées trouvées
+    paginator = ResultPaginator(rendered, lang)
+    view = paginator if paginator.page_count > 1 else None
+    embeds = paginator.build_embeds()
+    files = paginator.build_files()
+    trace_phase("send")
+    if interaction.response.is_done():
+        await dispatcher.edit_original(content=None, embeds=embeds, attachments=files, view=view)
+    else:
+        await dispatcher.send(embeds=embeds, files=files, view=view)
+    paginator.interaction = interaction
+    dispatcher.finish()
+
+class AutocompleteSession:
+    """Dernière saisie d'un utilisateur pour une commande : numéro de frappe et résultats associés"""
+    __slots__ = ("seq", "query", "candidates", "context", "choices", "updated")
+    
+    def __init__(self):
+        self.seq = 0
+        self.query = None       # saisie (normalisée par fold_search_text) ayant produit candidates
+        self.candidates = []    # positions dans search_index des noms correspondant à cette saisie
+        self.context = None     # (génération du jeu de données, version des traductions)
+        self.choices = []       # dernière réponse envoyée
+        self.updated = 0.0
+
+# Sessions d'autocomplétion par (utilisateur, commande, langue), les plus anciennes évincées en premier
+AUTOCOMPLETE_SESSIONS = OrderedDict()
+
+def autocomplete_session(key):
+    """Session d'autocomplétion d'un utilisateur (créée au besoin)"""
+    session = AUTOCOMPLETE_SESSIONS.get(key)
+    if session is None:
+        session = AUTOCOMPLETE_SESSIONS[key] = AutocompleteSession()
+        while len(AUTOCOMPLETE_SESSIONS) > AUTOCOMPLETE_SESSIONS_MAX:
+            AUTOCOMPLETE_SESSIONS.popitem(last=False)
+    else:
+        AUTOCOMPLETE_SESSIONS.move_to_end(key)
+    return session
 
 async def pokemon_autocomplete(interaction: discord.Interaction, current: str, lang: str):
     """Fonction d'autocomplétion pour les Pokémon dans la langue spécifiée"""
-    current_lower = current.lower()
+    current_key = fold_search_text(current)
+    session = autocomplete_session((interaction.user.id, "pokemon", lang))
+    session.seq += 1
+    seq = session.seq
+    
+    # Discord envoie une interaction par frappe : on laisse à la suivante le temps d'arriver
+    if AUTOCOMPLETE_DEBOUNCE_MS > 0:
+        trace_phase("debounce")
+        await asyncio.sleep(AUTOCOMPLETE_DEBOUNCE_MS / 1000)
+    trace_phase("loading")
+    dataset = await dataset_for(interaction, autocomplete=True)
+    if dataset is None:
+        return []
+    if session.seq != seq:
+        # Frappe dépassée par une plus récente : réponse immédiate avec les derniers résultats, sans calcul
+        METRICS.inc("autocomplete_superseded_total", lang=lang)
+        return session.choices
     
     # Utiliser un dictionnaire pour stocker les noms uniques et éviter les doublons
     unique_pokemon = {}
+    snapshot = TRANSLATIONS
+    translations = snapshot.translations
     
-    for entry in spawn_data:
-        pokemon_name = safe_field(entry.get("Pokemon"))
-        if pokemon_name == "∅":
-            continue
+    # La correspondance se fait par sous-chaîne : si la saisie précédente est contenue dans la nouvelle
+    # (« char » → « chari »), les résultats ne peuvent être que parmi les candidats précédents
+    trace_phase("matching")
+    context = (dataset.generation, snapshot.version)
+    index = dataset.search_index
+    _, translated_keys, _ = index.translated(lang, snapshot)
+    positions = range(len(index.names))
+    if (session.context == context and session.query is not None and session.query in current_key
+            and time.monotonic() - session.updated < AUTOCOMPLETE_CACHE_TTL):
+        positions = session.candidates
+        METRICS.inc("autocomplete_narrowed_total", lang=lang)
+    candidates = []
+    
+    # Parcourir les noms distincts plutôt que toutes les lignes, sur les clés préparées
+    for position in positions:
+        translated = translated_keys[position]
+        if current_key in index.originals[position] or (translated is not None and current_key in translated):
+            candidates.append(position)
+            pokemon_name = index.names[position]
+            # Traduction seulement si elle existe déjà dans le cache, sinon le nom original
+            translated_name = pokemon_name
+            if pokemon_name in translations and translations[pokemon_name].get(lang):
+                translated_name = translations[pokemon_name][lang]
             
-        # Obtenir la traduction seulement si elle existe déjà dans le cache
-        translated_name = pokemon_name  # Par défaut, utiliser le nom original
-        
-        if pokemon_name in TRANSLATIONS_CACHE and lang in TRANSLATIONS_CACHE[pokemon_name]:
-            translated_name = TRANSLATIONS_CACHE[pokemon_name][lang]
-        
-        # Vérifier si la recherche correspond à un des noms
-        if current_lower in translated_name.lower() or current_lower in pokemon_name.lower():
             # Créer une clé unique basée sur la traduction et le nom original
             unique_key = f"{translated_name}|{pokemon_name}"
             
@@ -930,61 +2657,349 @@ async def pokemon_autocomplete(interaction: discord.Interaction, current: str, l
     
     # Convertir le dictionnaire en liste
     choices = list(unique_pokemon.values())
+    trace_results(len(choices))
     
     # Limiter à 25 résultats et trier
-    return sorted(choices, key=lambda x: x.name)[:25]
+    trace_phase("sorting")
+    choices = sorted(choices, key=lambda x: x.name)[:25]
+    
+    session.query = current_key
+    session.candidates = candidates
+    session.context = context
+    session.choices = choices
+    session.updated = time.monotonic()
+    return choices
+
+def resolve_biome(dataset, biome):
+    """Retrouve l'identifiant exact d'un biome (avec ou sans espace de noms)"""
+    if biome in dataset.rows_by_biome:
+        return biome
+    biome_lower = biome.lower().strip()
+    candidates = [b for b in dataset.biomes if b.lower() == biome_lower or b.lower().endswith(f":{biome_lower}")]
+    return candidates[0] if len(candidates) == 1 else None
+
+def competitor_sort_key(value):
+    try:
+        return float(value)
+    except ValueError:
+        return float("inf")
+
+def render_biome_results(dataset, biome, time_range, lang):
+    """Met en forme les spawns d'un biome, regroupés par rareté (passe par le cache LRU des réponses)"""
+    key = (dataset.generation, "biome", biome, time_range, lang)
+    rendered = RENDER_CACHE.get(key, TRANSLATIONS.version)
+    if rendered is not None:
+        return rendered
+    
+    pack = LANGUAGE_PACKS[lang]
+    by_bucket = {}
+    for row_id in dataset.rows_by_biome.get(biome, []):
+        row = dataset.rows[row_id]
+        row_time = row.get("Time Range")
+        # Sans plage horaire (ou « any »), le Pokémon apparaît à toute heure
+        if time_range and row_time not in ("∅", "any", time_range):
+            continue
+        
+        competitors = row.get("Nombre de concurrents")
+        is_best = biome in split_list_field(row.get("Meilleurs biomes de spawn"))
+        line = f"• **{get_cached_pokemon_name(row.get('Pokemon'), lang)}**"
+        if competitors != "∅":
+            line += f" — 🥇 {competitors}"
+        if is_best:
+            line += " ⭐"
+        if row_time != "∅":
+            line += f" · ⏰ {row_time}"
+        by_bucket.setdefault(row.get("Bucket"), []).append((not is_best, competitor_sort_key(competitors), line))
+    
+    rendered = []
+    biome_label = f"{biome} ⏰ {time_range}" if time_range else biome
+    buckets = sorted(by_bucket, key=lambda b: (BUCKET_ORDER.index(b) if b in BUCKET_ORDER else len(BUCKET_ORDER), b))
+    for bucket in buckets:
+        # Les meilleurs spawns d'abord, puis le moins de concurrents ; lignes identiques fusionnées
+        lines = list(dict.fromkeys(line for _, _, line in sorted(by_bucket[bucket])))
+        # Le titre compte les lignes affichées, après fusion des doublons
+        title = pack.biome_title.format(biome=biome_label, bucket=bucket, count=len(lines))[:EMBED_TITLE_LIMIT]
+        if not rendered:
+            lines.insert(0, f"*{pack.biome_legend}*")
+        rendered.append((title, prepare_message_parts(lines, ""), []))
+    
+    RENDER_CACHE.put(key, rendered)
+    return rendered
 
-# Création des commandes
-@bot.tree.command(guild=discord.Object(id=GUILD_ID), name="where", description=COMMAND_DESCRIPTIONS["en"])
-@app_commands.describe(pokemon="Name of the Pokémon", show_all="Show all fields (even empty ones)")
-async def where(interaction: discord.Interaction, pokemon: str, show_all: bool = False):
-    await pokemon_search(interaction, pokemon, "en", show_all)
+async def biome_search(interaction: discord.Interaction, biome: str, lang: str, time: str = None):
+    """Répond à « qu'est-ce qui apparaît dans ce biome ? » à partir de l'index inverse des biomes"""
+    trace_phase("loading")
+    dataset = await dataset_for(interaction)
+    pack = LANGUAGE_PACKS[lang]
+    dispatcher = ResponseDispatcher(interaction, f"biome:{lang}")
+    
+    trace_phase("rendering")
+    biome_id = resolve_biome(dataset, biome)
+    rendered = render_biome_results(dataset, biome_id, time, lang) if biome_id else []
+    trace_phase("send")
+    if not rendered:
+        await dispatcher.send(content=pack.biome_not_found.format(biome=biome))
+        dispatcher.finish()
+        return
+    
+    paginator = ResultPaginator(rendered, lang)
+    await dispatcher.send(embeds=paginator.build_embeds(), view=paginator if paginator.page_count > 1 else None)
+    paginator.interaction = interaction
+    dispatcher.finish()
 
-@where.autocomplete("pokemon")
-async def where_autocomplete(interaction: discord.Interaction, current: str):
-    return await pokemon_autocomplete(interaction, current, "en")
+async def biome_autocomplete(interaction: discord.Interaction, current: str):
+    """Autocomplétion des identifiants de biomes : préfixe par recherche dichotomique, puis sous-chaîne"""
+    dataset = await dataset_for(interaction, autocomplete=True)
+    if dataset is None:
+        return []
+    biomes = dataset.biomes
+    current_lower = current.lower().strip()
+    start = bisect.bisect_left(biomes, current_lower)
+    matches = []
+    for biome in biomes[start:]:
+        if not biome.startswith(current_lower) or len(matches) >= 25:
+            break
+        matches.append(biome)
+    if len(matches) < 25:
+        # « cherry » doit aussi trouver « minecraft:cherry_grove »
+        for biome in biomes:
+            if current_lower in biome and biome not in matches:
+                matches.append(biome)
+                if len(matches) >= 25:
+                    break
+    return [app_commands.Choice(name=biome, value=biome) for biome in matches]
+
+async def time_range_autocomplete(interaction: discord.Interaction, current: str):
+    """Autocomplétion des plages horaires présentes dans les données"""
+    current_lower = current.lower()
+    dataset = await dataset_for(interaction, autocomplete=True)
+    if dataset is None:
+        return []
+    time_ranges = dataset.time_ranges
+    return [app_commands.Choice(name=time_range, value=time_range)
+            for time_range in time_ranges if current_lower in time_range.lower()][:25]
 
-@bot.tree.command(guild=discord.Object(id=GUILD_ID), name="tesou", description=COMMAND_DESCRIPTIONS["fr"])
-@app_commands.describe(pokemon="Nom du Pokémon recherché", show_all="Afficher tous les champs (même vides)")
-async def tesou(interaction: discord.Interaction, pokemon: str, show_all: bool = False):
-    await pokemon_search(interaction, pokemon, "fr", show_all)
+def query_filters(dataset, filters):
+    """Combine les bitmaps des filtres demandés (option -> valeur) : un OU par valeur acceptée, un ET par filtre"""
+    matches = dataset.all_rows
+    for option, value in filters.items():
+        column, unconstrained = FILTER_COLUMNS[option]
+        bitmap = dataset.bitmaps[column]
+        bits = dataset.non_empty[column] if value == "*" else bitmap.get(value, 0)
+        for wildcard in unconstrained:
+            bits |= bitmap.get(wildcard, 0)
+        matches &= bits
+        if not matches:
+            break
+    return matches
 
-@tesou.autocomplete("pokemon")
-async def tesou_autocomplete(interaction: discord.Interaction, current: str):
-    return await pokemon_autocomplete(interaction, current, "fr")
+def iter_bits(bits):
+    """Indices des bits à 1, dans l'ordre croissant"""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
 
-@bot.tree.command(guild=discord.Object(id=GUILD_ID), name="wobistdu", description=COMMAND_DESCRIPTIONS["de"])
-@app_commands.describe(pokemon="Name des Pokémon", show_all="Alle Felder anzeigen (auch leere)")
-async def wobistdu(interaction: discord.Interaction, pokemon: str, show_all: bool = False):
-    await pokemon_search(interaction, pokemon, "de", show_all)
+def render_filter_results(dataset, filters, lang):
+    """Met en forme les spawns correspondant aux filtres, regroupés par rareté (passe par le cache LRU des réponses)"""
+    key = (dataset.generation, "filter", tuple(sorted(filters.items())), lang)
+    rendered = RENDER_CACHE.get(key, TRANSLATIONS.version)
+    if rendered is not None:
+        return rendered
+    
+    pack = LANGUAGE_PACKS[lang]
+    labels = {column: label for _, label, column, _ in pack.fields}
+    filters_label = ", ".join(f"{labels.get(FILTER_COLUMNS[option][0], option)}: {value}" for option, value in filters.items())
+    
+    by_bucket = {}
+    for row_id in iter_bits(query_filters(dataset, filters)):
+        row = dataset.rows[row_id]
+        biomes = split_list_field(row.get("Meilleurs biomes de spawn")) or split_list_field(row.get("Biomes"))
+        line = f"• **{get_cached_pokemon_name(row.get('Pokemon'), lang)}**"
+        if biomes:
+            line += f" — 🌟 {', '.join(biomes[:3])}" + (f" (+{len(biomes) - 3})" if len(biomes) > 3 else "")
+        by_bucket.setdefault(row.get("Bucket"), []).append(line)
+    
+    rendered = []
+    buckets = sorted(by_bucket, key=lambda b: (BUCKET_ORDER.index(b) if b in BUCKET_ORDER else len(BUCKET_ORDER), b))
+    for bucket in buckets:
+        lines = list(dict.fromkeys(by_bucket[bucket]))
+        # Le titre compte les lignes affichées, après fusion des doublons
+        title = pack.filter_title.format(filters=filters_label, bucket=bucket, count=len(lines))[:EMBED_TITLE_LIMIT]
+        rendered.append((title, prepare_message_parts(lines, ""), []))
+    
+    RENDER_CACHE.put(key, rendered)
+    return rendered
 
-@wobistdu.autocomplete("pokemon")
-async def wobistdu_autocomplete(interaction: discord.Interaction, current: str):
-    return await pokemon_autocomplete(interaction, current, "de")
+async def filter_search(interaction: discord.Interaction, filters: dict, lang: str):
+    """Répond à une requête multi-critères (rareté, dimension, météo, heure...) à partir des bitmaps"""
+    pack = LANGUAGE_PACKS[lang]
+    dispatcher = ResponseDispatcher(interaction, f"filter:{lang}")
+    filters = {option: value for option, value in filters.items() if value is not None}
+    
+    if not filters:
+        trace_phase("send")
+        await dispatcher.send(content=pack.filter_no_filter)
+        dispatcher.finish()
+        return
+    
+    trace_phase("loading")
+    dataset = await dataset_for(interaction)
+    trace_phase("rendering")
+    rendered = render_filter_results(dataset, filters, lang)
+    trace_phase("send")
+    if not rendered:
+        await dispatcher.send(content=pack.filter_not_found)
+        dispatcher.finish()
+        return
+    
+    paginator = ResultPaginator(rendered, lang)
+    await dispatcher.send(embeds=paginator.build_embeds(), view=paginator if paginator.page_count > 1 else None)
+    paginator.interaction = interaction
+    dispatcher.finish()
 
-@bot.tree.command(guild=discord.Object(id=GUILD_ID), name="doko", description=COMMAND_DESCRIPTIONS["ja"])
-@app_commands.describe(pokemon="ポケモンの名前", show_all="すべてのフィールドを表示（空欄も含む）")
-async def doko(interaction: discord.Interaction, pokemon: str, show_all: bool = False):
-    await pokemon_search(interaction, pokemon, "ja", show_all)
+def filter_value_autocomplete(column):
+    """Crée l'autocomplétion des valeurs présentes dans une colonne filtrable (« * » = toute valeur renseignée)"""
+    async def autocomplete(interaction: discord.Interaction, current: str):
+        current_lower = current.lower()
+        dataset = await dataset_for(interaction, autocomplete=True)
+        if dataset is None:
+            return []
+        bitmap = dataset.bitmaps[column]
+        values = ["*"] + sorted(value for value in bitmap if value != "∅")
+        return [app_commands.Choice(name=value, value=value) for value in values if current_lower in value.lower()][:25]
+    return autocomplete
 
-@doko.autocomplete("pokemon")
-async def doko_autocomplete(interaction: discord.Interaction, current: str):
-    return await pokemon_autocomplete(interaction, current, "ja")
+# Création des commandes : une commande par langue du catalogue de localisation
+def register_search_command(lang):
+    """Enregistre la commande de recherche et son autocomplétion pour une langue"""
+    pack = LANGUAGE_PACKS[lang]
+    
+    @app_commands.command(name=pack.command, description=pack.description)
+    @app_commands.describe(pokemon=pack.option_pokemon, show_all=pack.option_show_all)
+    async def search_command(interaction: discord.Interaction, pokemon: str, show_all: bool = False):
+        with trace_interaction("pokemon_search", lang, pokemon):
+            await pokemon_search(interaction, pokemon, lang, show_all)
+    
+    @search_command.autocomplete("pokemon")
+    async def search_autocomplete(interaction: discord.Interaction, current: str):
+        with trace_interaction("pokemon_autocomplete", lang, current):
+            return await pokemon_autocomplete(interaction, current, lang)
+    
+    add_app_command(search_command)
+
+def register_biome_command(lang):
+    """Enregistre la commande inverse par biome pour une langue"""
+    pack = LANGUAGE_PACKS[lang]
+    
+    @app_commands.command(name=pack.biome_command, description=pack.biome_description)
+    @app_commands.describe(biome=pack.option_biome, time=pack.option_time)
+    async def biome_command(interaction: discord.Interaction, biome: str, time: str = None):
+        with trace_interaction("biome_search", lang, biome):
+            await biome_search(interaction, biome, lang, time)
+    
+    biome_command.autocomplete("biome")(biome_autocomplete)
+    biome_command.autocomplete("time")(time_range_autocomplete)
+    
+    add_app_command(biome_command)
+
+def register_filter_command(lang):
+    """Enregistre la commande de filtres multi-critères pour une langue"""
+    pack = LANGUAGE_PACKS[lang]
+    
+    @app_commands.command(name=pack.filter_command, description=pack.filter_description)
+    @app_commands.describe(**pack.filter_options)
+    async def filter_command(interaction: discord.Interaction, bucket: str = None, dimension: str = None, time: str = None,
+                             raining: bool = None, thundering: bool = None, sky: bool = None, context: str = None,
+                             moon_phase: str = None, key_item: str = None):
+        flags = {"raining": raining, "thundering": thundering, "sky": sky}
+        filters = {"bucket": bucket, "dimension": dimension, "time": time, "context": context, "moon_phase": moon_phase, "key_item": key_item}
+        filters.update({option: str(flag).lower() for option, flag in flags.items() if flag is not None})
+        with trace_interaction("filter_search", lang, ", ".join(f"{option}={value}" for option, value in filters.items() if value is not None)):
+            await filter_search(interaction, filters, lang)
+    
+    for option in ("bucket", "dimension", "time", "context", "moon_phase", "key_item"):
+        filter_command.autocomplete(option)(filter_value_autocomplete(FILTER_COLUMNS[option][0]))
+    
+    add_app_command(filter_command)
+
+for lang in LANGUAGE_PACKS:
+    register_search_command(lang)
+    if LANGUAGE_PACKS[lang].biome_command:
+        register_biome_command(lang)
+    if LANGUAGE_PACKS[lang].filter_command:
+        register_filter_command(lang)
 
 @bot.event
 async def on_ready():
-    load_translations_cache()
-    load_spawn_data_from_excel()
+    # on_ready est rappelé à chaque reconnexion : les données partagées ne sont chargées qu'une fois,
+    # le rechargement à chaud s'occupe ensuite des mises à jour
+    global translation_resolver_started, spawn_data_watcher_started, commands_synced
+    if EXCEL_FILE not in DATASETS:
+        with startup_timer("translations"):
+            load_translations_cache()
+        with startup_timer("data"):
+            load_spawn_data_from_excel()
+        
+        # Précharger toutes les traductions dans un thread séparé
+        async_preload_translations()
     
-    # Précharger toutes les traductions dans un thread séparé
-    async_preload_translations()
+    # Résolution en arrière-plan des traductions manquantes demandées par les commandes
+    if not translation_resolver_started:
+        start_translation_resolver()
+        translation_resolver_started = True
     
-    guild = discord.Object(id=GUILD_ID)
-    try:
-        synced = await bot.tree.sync(guild=guild)
-        logging.info(f"{len(synced)} commandes synchronisées sur le serveur {guild.id}.")
-    except Exception as e:
-        logging.error(f"Erreur de synchronisation des commandes : {e}")
-    logging.info(f"✅ Bot connecté en tant que {bot.user}")
+    # Rechargement à chaud des données quand le fichier Excel change
+    if not spawn_data_watcher_started:
+        start_spawn_data_watcher()
+        spawn_data_watcher_started = True
+    
+    # Métriques exposées en HTTP pour la supervision
+    global metrics_server_started
+    if METRICS_PORT and not metrics_server_started:
+        start_metrics_server()
+        metrics_server_started = True
+    
+    # Profileur activable à chaud avec « kill -USR2 <pid> » (ou POST /profiler/start sur le serveur de métriques)
+    if hasattr(signal, "SIGUSR2"):
+        signal.signal(signal.SIGUSR2, lambda signum, frame: PROFILER.toggle())
+    if SAMPLING_PROFILER and not PROFILER.running:
+        PROFILER.start()
+    
+    if not commands_synced:
+        with startup_timer("sync"):
+            commands_synced = await sync_commands()
+    logging.info(f"✅ Bot connecté en tant que {bot.user} sur {len(bot.guilds)} serveur(s), {bot.shard_count or 1} shard(s)")
+    log_startup_report()
+
+async def sync_commands():
+    """Synchronise les commandes avec Discord (globalement ou serveur par serveur). Retourne True si tout a réussi."""
+    if GLOBAL_COMMANDS:
+        try:
+            synced = await bot.tree.sync()
+            logging.info(f"{len(synced)} commandes globales synchronisées (propagation jusqu'à une heure).")
+            return True
+        except Exception as e:
+            logging.error(f"Erreur de synchronisation des commandes globales : {e}")
+            return False
+    
+    success = True
+    for guild_id in GUILD_IDS:
+        try:
+            synced = await bot.tree.sync(guild=discord.Object(id=guild_id))
+            logging.info(f"{len(synced)} commandes synchronisées sur le serveur {guild_id}.")
+        except Exception as e:
+            # Un serveur inaccessible (bot retiré, permissions) ne bloque pas les autres
+            logging.error(f"Erreur de synchronisation des commandes sur le serveur {guild_id} : {e}")
+            success = False
+    return success
+
+def main():
+    if not GUILD_IDS and not GLOBAL_COMMANDS:
+        logging.error("❌ DISCORD_GUILD_ID n'est pas défini (ni DISCORD_GLOBAL_COMMANDS=1). Vérifie tes variables d'environnement.")
+        exit(1)
+    bot.run(TOKEN)
 
-bot.run(TOKEN)
+# Le module reste importable sans lancer le bot (banc de charge, scripts)
+if __name__ == "__main__":
+    main()